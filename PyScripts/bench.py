@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import platform
+import socket
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import data
+import encoding
+import game
+
+BENCH_PAYLOAD = {"date": "2024-04-01", "crop": "wheat", "fertilizer": "medium", "irrigation": "drip"}
+# Soil layers in the synthetic profile for the encoder cases (a fine-grained SNOMIN column).
+PROFILE_LAYERS = 2000
+# Years of synthetic weather generated per operation in the synthetic_weather case.
+SYNTHETIC_YEARS = 10
+
+
+# ---------------------------------------------------------------------------
+# Offline weather fixture
+# ---------------------------------------------------------------------------
+def _fixture_parameters(lat: float, lon: float, start_str: str, end_str: str) -> Dict[str, Dict[str, float]]:
+    """Deterministic POWER-shaped payload (POWER units) so the real conversion code still runs."""
+    start = datetime.strptime(start_str, "%Y%m%d").date()
+    end = datetime.strptime(end_str, "%Y%m%d").date()
+    payload: Dict[str, Dict[str, float]] = {name: {} for name in data._POWER_PARAMETERS.split(",")}
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    for day, synthetic in zip(days, data.synthetic_weather_days(lat, lon, days)):
+        key = day.strftime("%Y%m%d")
+        payload["ALLSKY_SFC_SW_DWN"][key] = synthetic["IRRAD"] / 3_600_000.0
+        payload["T2M_MAX"][key] = synthetic["TMAX"]
+        payload["T2M_MIN"][key] = synthetic["TMIN"]
+        payload["PRECTOTCORR"][key] = synthetic["RAIN"] * 10.0
+        payload["QV2M"][key] = 8.0
+        payload["PS"][key] = 100.5
+        payload["WS2M"][key] = synthetic["WIND"]
+        payload["ET0"][key] = synthetic["ET0"] * 10.0
+    return payload
+
+
+def install_fixture() -> None:
+    """Route every POWER fetch to the fixture and use a private in-memory weather cache."""
+    data._fetch_power_parameters = _fixture_parameters
+    data.set_weather_cache(data.WeatherCache(":memory:"))
+    game.configure_logging("WARNING", 0.0)
+
+
+def _reset_weather_cache() -> None:
+    data.get_weather_cache().clear()
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+class Case:
+    def __init__(self, name: str, setup: Callable[[], Any], run: Callable[[Any], Any]) -> None:
+        self.name = name
+        self.setup = setup
+        self.run = run
+
+
+def _new_session(steps: int = 0) -> Dict[str, Any]:
+    session: Dict[str, Any] = {"game": None, "ticks": 0}
+    game._handle_init(session, dict(BENCH_PAYLOAD))
+    if steps:
+        game._handle_tick(session, steps)
+    return session
+
+
+def _case_simulate() -> Case:
+    def run(_: Any) -> Any:
+        _reset_weather_cache()
+        return game.simulate_game(dict(BENCH_PAYLOAD))
+    return Case("simulate_120d", lambda: None, run)
+
+
+def _case_tick() -> Case:
+    holder: Dict[str, Any] = {}
+    def setup() -> Any:
+        holder["session"] = _new_session()
+        return holder
+    def run(state: Dict[str, Any]) -> Any:
+        result = game._handle_tick(state["session"], 1)
+        if result["finished"] or state["session"]["ticks"] >= game.SIM_DAYS:
+            state["session"] = _new_session()
+        return result
+    return Case("handle_tick_1", setup, run)
+
+
+def _case_get_state() -> Case:
+    return Case("get_state", lambda: _new_session(30)["game"], lambda crop_game: crop_game.get_state())
+
+
+def _case_json() -> Case:
+    def setup() -> Any:
+        session = _new_session()
+        return {"ok": True, "result": game._handle_tick(session, 30)}
+    return Case("json_tick_response", setup, lambda response: json.dumps(response, default=game._json_default))
+
+
+def _profile_response() -> Dict[str, Any]:
+    session = _new_session()
+    result = game._handle_tick(session, 30)
+    profile = [0.2 + 0.0001 * layer for layer in range(PROFILE_LAYERS)]
+    result["state"]["SM_profile"] = game._np.array(profile) if game._np is not None else profile
+    return {"ok": True, "result": result}
+
+
+def _case_encode(encoder_name: str) -> Case:
+    """Encode a tick response whose SM_profile is a large numpy array, as the server frames it."""
+    def setup() -> Any:
+        return encoding.make_encoder(encoder_name, default=game._json_default), _profile_response()
+    return Case(f"encode_profile_{encoder_name}", setup, lambda state: state[0].dumps(state[1]))
+
+
+def _case_encode_msgpack() -> Case:
+    codec = game._CODECS[game.PROTOCOL_MSGPACK]
+    return Case("encode_profile_msgpack", _profile_response, codec.encode)
+
+
+def _case_synthetic_weather() -> Case:
+    days = [datetime(2015, 1, 1).date() + timedelta(days=offset) for offset in range(SYNTHETIC_YEARS * 365)]
+    return Case(f"synthetic_weather_{SYNTHETIC_YEARS}y", lambda: None, lambda _: data.synthetic_weather_days(52.0, 5.0, days))
+
+
+def _case_fork() -> Case:
+    return Case("snapshot_fork", lambda: _new_session(30)["game"], lambda crop_game: crop_game.fork())
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((game.HOST, 0))
+        return probe.getsockname()[1]
+
+
+def _case_socket() -> Case:
+    holder: Dict[str, Any] = {}
+    def setup() -> Any:
+        port = _free_port()
+        threading.Thread(target=game.serve_forever, args=(game.HOST, port), daemon=True).start()
+        deadline = time.time() + 10.0
+        while True:
+            try:
+                conn = socket.create_connection((game.HOST, port))
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+        reader = conn.makefile("rb")
+        reader.readline()
+        holder.update(conn=conn, reader=reader, ticks=0)
+        _request(holder, dict(BENCH_PAYLOAD, action="init"))
+        return holder
+    def run(state: Dict[str, Any]) -> Any:
+        response = _request(state, {"action": "tick", "steps": 1})
+        state["ticks"] += 1
+        if response["result"]["finished"] or state["ticks"] >= game.SIM_DAYS:
+            _request(state, dict(BENCH_PAYLOAD, action="init"))
+            state["ticks"] = 0
+        return response
+    return Case("socket_tick_roundtrip", setup, run)
+
+
+def _request(state: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    state["conn"].sendall((json.dumps(payload) + "\n").encode("utf-8"))
+    response = json.loads(state["reader"].readline())
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error"))
+    return response
+
+
+CASES: Dict[str, Callable[[], Case]] = {
+    "simulate_120d": _case_simulate,
+    "handle_tick_1": _case_tick,
+    "get_state": _case_get_state,
+    "json_tick_response": _case_json,
+    "snapshot_fork": _case_fork,
+    "socket_tick_roundtrip": _case_socket,
+    f"synthetic_weather_{SYNTHETIC_YEARS}y": _case_synthetic_weather,
+}
+for _encoder_name in encoding.available_encoders():
+    CASES[f"encode_profile_{_encoder_name}"] = functools.partial(_case_encode, _encoder_name)
+if encoding.msgpack_available():
+    CASES["encode_profile_msgpack"] = _case_encode_msgpack
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def run_case(case: Case, min_time: float, min_ops: int, warmup: int) -> Dict[str, float]:
+    state = case.setup()
+    for _ in range(warmup):
+        case.run(state)
+    timings: List[float] = []
+    perf = time.perf_counter
+    started = perf()
+    while len(timings) < min_ops or perf() - started < min_time:
+        op_started = perf()
+        case.run(state)
+        timings.append(perf() - op_started)
+    total = sum(timings)
+    timings.sort()
+    return {
+        "n": len(timings),
+        "ops_per_s": len(timings) / total if total else 0.0,
+        "p50_ms": _percentile(timings, 0.50) * 1000.0,
+        "p99_ms": _percentile(timings, 0.99) * 1000.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def _print_table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+    header = f"{'case':<24}{'n':>8}{'ops/s':>12}{'p50 ms':>11}{'p99 ms':>11}"
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    print(header)
+    for name, result in results.items():
+        line = f"{name:<24}{result['n']:>8}{result['ops_per_s']:>12.1f}{result['p50_ms']:>11.3f}{result['p99_ms']:>11.3f}"
+        if baseline is not None:
+            base = baseline.get(name)
+            if base and base.get("ops_per_s"):
+                line += f"{result['ops_per_s'] / base['ops_per_s']:>9.2f}x"
+            else:
+                line += f"{'-':>10}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the crop server hot paths offline.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--min-time", type=float, default=2.0, help="seconds to spend per case")
+    parser.add_argument("--min-ops", type=int, default=5, help="minimum timed operations per case")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results from an earlier --save to compare against")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    install_fixture()
+    results: Dict[str, Dict[str, float]] = {}
+    for name in args.cases or list(CASES):
+        results[name] = run_case(CASES[name](), args.min_time, args.min_ops, args.warmup)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            saved = json.load(handle)
+        baseline = saved.get("results", {})
+        print(f"baseline: commit {saved.get('commit')} ({saved.get('timestamp')})")
+    _print_table(results, baseline)
+
+    if args.save:
+        report = {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
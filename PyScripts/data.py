@@ -1,17 +1,37 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from datetime import date, datetime
-from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import argparse
+import csv
+import json
 import math
+import os
 import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 try:
     import requests  # type: ignore
 except ImportError:  # pragma: no cover
     requests = None
 
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - numpy is optional
+    _np = None
+
+try:
+    import xarray as _xr
+except ImportError:  # pragma: no cover - xarray is optional
+    _xr = None
+
+from metrics import METRICS
+
 # ---------------------------------------------------------------------------
 # Soil profile (SNOMIN compatible)
 # ---------------------------------------------------------------------------
@@ -93,10 +113,75 @@ _SOIL_TEMPLATE = {
 }
 _SOIL_TEMPLATE["RDMSOL"] = sum(layer["Thickness"] for layer in _SOIL_TEMPLATE["SoilProfileDescription"]["SoilLayers"])
 
+# Distinct (lat, lon, elev, start_soil_n) site parameter sets kept in memory.
+SITE_CACHE_SIZE = int(os.environ.get("SMARTFARMING_SITE_CACHE", "1024"))
+
+
+class FrozenParameters(dict):
+    """Read-only parameter mapping shared by every session in the process.
+
+    Per-session changes belong in the session's ParameterProvider overrides. Only the top
+    level is frozen: pcse turns the nested soil layer dicts into its own objects, so they
+    stay plain dicts and must be treated as read-only too.
+    """
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Shared parameters are read-only; override them on the ParameterProvider.")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenParameters, (dict(self),))
+
+
+
+_SOIL_PROFILE = FrozenParameters(_SOIL_TEMPLATE)
 
-def get_soil_profile() -> Dict:
-    """Return a deep copy of the SNOMIN soil profile."""
-    return deepcopy(_SOIL_TEMPLATE)
+
+def get_soil_profile() -> FrozenParameters:
+    """Return the shared, read-only SNOMIN soil profile."""
+    return _SOIL_PROFILE
+
+
+class SiteCache:
+    """Bounded LRU of frozen site parameter sets keyed by (lat, lon, elev, start_soil_n)."""
+    def __init__(self, max_sites: int = SITE_CACHE_SIZE) -> None:
+        self.max_sites = max(1, int(max_sites))
+        self._sites: "OrderedDict[Tuple[float, ...], FrozenParameters]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[float, ...], build: Callable[[], Dict[str, Any]]) -> FrozenParameters:
+        with self._lock:
+            site = self._sites.get(key)
+            if site is not None:
+                self._sites.move_to_end(key)
+                return site
+        site = FrozenParameters(build())
+        with self._lock:
+            site = self._sites.setdefault(key, site)
+            self._sites.move_to_end(key)
+            while len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+        return site
+
+    def __len__(self) -> int:
+        return len(self._sites)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+
+
+_site_cache = SiteCache()
+
+
+def get_site_cache() -> SiteCache:
+    return _site_cache
+
+
+def set_site_cache(cache: Optional[SiteCache]) -> None:
+    global _site_cache
+    _site_cache = cache or SiteCache()
 
 
 def get_site_parameters(lat: float, lon: float, elev: float, soil: Dict, start_soil_n: float = 60.0) -> Dict:
@@ -171,34 +256,69 @@ def _calc_vap(qv2m: Optional[float], ps: Optional[float]) -> Optional[float]:
     return vap_kpa * 10.0  # hPa
 
 
-def _nasa_power_weather(lat: float, lon: float, day_str: str) -> Optional[Dict[str, float]]:
+POWER_DEFAULT_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+_POWER_BASE_URL = os.environ.get("SMARTFARMING_POWER_URL") or POWER_DEFAULT_URL
+_POWER_PARAMETERS = "ALLSKY_SFC_SW_DWN,T2M_MAX,T2M_MIN,PRECTOTCORR,QV2M,PS,WS2M,ET0"
+_POWER_FILL_VALUE = -999.0
+POWER_TIMEOUT = 12
+# Keep-alive connections held open to the POWER host (at least one per prefetch worker).
+HTTP_POOL_SIZE = int(os.environ.get("SMARTFARMING_HTTP_POOL", "8"))
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def set_power_base_url(url: Optional[str]) -> None:
+    """Point POWER requests at another endpoint (e.g. a local stub server); None restores the default."""
+    global _POWER_BASE_URL
+    _POWER_BASE_URL = url or POWER_DEFAULT_URL
+
+
+def _get_http_session():
+    """Process-wide pooled ``requests.Session`` so repeated fetches reuse TCP/TLS connections."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _fetch_power_parameters(lat: float, lon: float, start_str: str, end_str: str) -> Optional[Dict[str, Dict[str, float]]]:
     if requests is None:
         return None
 
     params = {
-        "parameters": "ALLSKY_SFC_SW_DWN,T2M_MAX,T2M_MIN,PRECTOTCORR,QV2M,PS,WS2M,ET0",
+        "parameters": _POWER_PARAMETERS,
         "community": "AG",
         "longitude": lon,
         "latitude": lat,
-        "start": day_str,
-        "end": day_str,
+        "start": start_str,
+        "end": end_str,
         "format": "JSON",
         "time-standard": "UTC",
     }
-    base = "https://power.larc.nasa.gov/api/temporal/daily/point"
     try:
-        resp = requests.get(base, params=params, timeout=12)
+        resp = _get_http_session().get(_POWER_BASE_URL, params=params, timeout=POWER_TIMEOUT)
         resp.raise_for_status()
-        payload = resp.json()["properties"]["parameter"]
+        return resp.json()["properties"]["parameter"]
     except Exception:
         return None
 
+
+def _convert_power_record(payload: Dict[str, Dict[str, float]], day_str: str) -> Optional[Dict[str, float]]:
     def pick(name: str) -> Optional[float]:
         series = payload.get(name)
         if not series:
             return None
         value = series.get(day_str)
-        return None if value is None else float(value)
+        if value is None or float(value) == _POWER_FILL_VALUE:
+            return None
+        return float(value)
 
     irr = pick("ALLSKY_SFC_SW_DWN")
     if irr is not None:
@@ -249,13 +369,475 @@ def _nasa_power_weather(lat: float, lon: float, day_str: str) -> Optional[Dict[s
     }
 
 
+def _nasa_power_weather(lat: float, lon: float, day_str: str) -> Optional[Dict[str, float]]:
+    payload = _fetch_power_parameters(lat, lon, day_str, day_str)
+    if payload is None:
+        return None
+    return _convert_power_record(payload, day_str)
+
+
+def _nasa_power_weather_range(lat: float, lon: float, start_str: str, end_str: str) -> Dict[str, Dict[str, float]]:
+    """Fetch every day in [start_str, end_str] with a single POWER request, keyed by YYYYMMDD."""
+    payload = _fetch_power_parameters(lat, lon, start_str, end_str)
+    if payload is None:
+        return {}
+    days = set()
+    for series in payload.values():
+        if isinstance(series, dict):
+            days.update(series.keys())
+    records: Dict[str, Dict[str, float]] = {}
+    for day_str in sorted(days):
+        record = _convert_power_record(payload, day_str)
+        if record is not None:
+            records[day_str] = record
+    return records
+
+
+
+
+# ---------------------------------------------------------------------------
+# Persistent weather cache
+# ---------------------------------------------------------------------------
+WEATHER_CACHE_PATH = os.environ.get(
+    "SMARTFARMING_WEATHER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".smartfarming", "weather_cache.sqlite3"),
+)
+WEATHER_CACHE_MAX_ROWS = int(os.environ.get("SMARTFARMING_WEATHER_CACHE_ROWS", "500000"))
+WEATHER_CACHE_DECIMALS = 2
+_EVICTION_CHECK_EVERY = 512
+
+
+class WeatherCache:
+    """SQLite store of converted POWER records keyed by rounded (lat, lon) cell and day.
+
+    Only real POWER data is stored; synthetic fallbacks are cheap to regenerate and must not
+    shadow real data once the network is back. Once the table grows past ``max_rows`` the
+    oldest rows are evicted first. Any SQLite failure degrades to a cache miss.
+    """
+    def __init__(self, path: str = WEATHER_CACHE_PATH, max_rows: int = WEATHER_CACHE_MAX_ROWS,
+                 decimals: int = WEATHER_CACHE_DECIMALS) -> None:
+        self.path = path
+        self.max_rows = max(1, int(max_rows))
+        self.decimals = decimals
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so worker processes reopen their own.
+        if self._conn is None or self._pid != os.getpid():
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS weather ("
+                "lat REAL NOT NULL, lon REAL NOT NULL, day TEXT NOT NULL, "
+                "record TEXT NOT NULL, stored REAL NOT NULL, "
+                "PRIMARY KEY (lat, lon, day)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS weather_stored ON weather (stored)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def cell(self, lat: float, lon: float) -> Tuple[float, float]:
+        return round(float(lat), self.decimals), round(float(lon), self.decimals)
+
+    def get(self, lat: float, lon: float, day_str: str) -> Optional[Dict[str, float]]:
+        return self.get_many(lat, lon, [day_str]).get(day_str)
+
+    def get_many(self, lat: float, lon: float, day_strs: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        days = list(day_strs)
+        if not days:
+            return {}
+        cell_lat, cell_lon = self.cell(lat, lon)
+        found: Dict[str, Dict[str, float]] = {}
+        try:
+            with self._lock:
+                conn = self._connect()
+                if len(days) == 1:
+                    rows = conn.execute(
+                        "SELECT day, record FROM weather WHERE lat = ? AND lon = ? AND day = ?",
+                        (cell_lat, cell_lon, days[0]),
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT day, record FROM weather WHERE lat = ? AND lon = ? AND day BETWEEN ? AND ?",
+                        (cell_lat, cell_lon, min(days), max(days)),
+                    ).fetchall()
+        except sqlite3.Error:
+            return {}
+        wanted = set(days)
+        for day_str, payload in rows:
+            if day_str in wanted:
+                found[day_str] = json.loads(payload)
+        return found
+
+    def put(self, lat: float, lon: float, day_str: str, record: Dict[str, float]) -> None:
+        self.put_many(lat, lon, {day_str: record})
+
+    def put_many(self, lat: float, lon: float, records: Dict[str, Dict[str, float]]) -> None:
+        if not records:
+            return
+        cell_lat, cell_lon = self.cell(lat, lon)
+        now = time.time()
+        rows = [(cell_lat, cell_lon, day_str, json.dumps(record), now) for day_str, record in records.items()]
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.executemany("INSERT OR REPLACE INTO weather VALUES (?, ?, ?, ?, ?)", rows)
+                self._writes += len(rows)
+                if self._writes >= _EVICTION_CHECK_EVERY:
+                    self._writes = 0
+                    self._evict(conn)
+        except sqlite3.Error:
+            return
+
+    def import_many(self, batches: Iterable[Tuple[float, float, Dict[str, Dict[str, float]]]]) -> int:
+        """Write (lat, lon, records) batches in one transaction, rolled back if it would exceed ``max_rows``.
+
+        Unlike ``put_many`` this raises on failure, so a bulk import is all or nothing.
+        """
+        now = time.time()
+        rows = []
+        for lat, lon, records in batches:
+            cell_lat, cell_lon = self.cell(lat, lon)
+            rows.extend((cell_lat, cell_lon, day_str, json.dumps(record), now) for day_str, record in records.items())
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany("INSERT OR REPLACE INTO weather VALUES (?, ?, ?, ?, ?)", rows)
+                (count,) = conn.execute("SELECT COUNT(*) FROM weather").fetchone()
+                if count > self.max_rows:
+                    raise ValueError(f"Import would grow the weather cache to {count} days, over its limit of "
+                                     f"{self.max_rows}; raise SMARTFARMING_WEATHER_CACHE_ROWS so days are not evicted.")
+        return len(rows)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM weather").fetchone()
+        excess = count - self.max_rows
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM weather WHERE (lat, lon, day) IN "
+                "(SELECT lat, lon, day FROM weather ORDER BY stored LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        if self is _weather_cache:
+            _tile_memory.clear()
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM weather")
+        except sqlite3.Error:
+            return
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+
+_weather_cache: Optional[WeatherCache] = None
+_weather_cache_lock = threading.Lock()
+
+
+def get_weather_cache() -> WeatherCache:
+    """Return the process-wide weather cache, opening it on first use."""
+    global _weather_cache
+    if _weather_cache is None:
+        with _weather_cache_lock:
+            if _weather_cache is None:
+                _weather_cache = WeatherCache()
+    return _weather_cache
+
+
+def set_weather_cache(cache: Optional[WeatherCache]) -> None:
+    """Swap the process-wide weather cache, e.g. to point it at a temporary file.
+
+    The tile memory in front of it is emptied too, so no record outlives its cache.
+    """
+    global _weather_cache
+    with _weather_cache_lock:
+        _weather_cache = cache
+    _tile_memory.clear()
+
+
+# ---------------------------------------------------------------------------
+# Spatial grid and in-process tile tier
+# ---------------------------------------------------------------------------
+# POWER's meteorology comes from MERRA-2: 0.5 deg latitude by 0.625 deg longitude cells.
+POWER_GRID_STEPS = (0.5, 0.625)
+TILE_MEMORY_TILES = int(os.environ.get("SMARTFARMING_TILE_MEMORY", "256"))
+# Days kept per tile; the least recently stored days go first (a season plus look-ahead fits).
+TILE_MEMORY_DAYS = int(os.environ.get("SMARTFARMING_TILE_MEMORY_DAYS", "366"))
+
+
+class WeatherGrid:
+    """Snaps coordinates to the centre of the source-grid cell (tile) they fall in.
+
+    Every coordinate inside a tile then shares one fetch, one cache entry and one synthetic
+    seed. Steps of 0 disable snapping (coordinates are used as given).
+    """
+    def __init__(self, lat_step: float = POWER_GRID_STEPS[0], lon_step: float = POWER_GRID_STEPS[1]) -> None:
+        self.lat_step = float(lat_step)
+        self.lon_step = float(lon_step)
+
+    def snap(self, lat: float, lon: float) -> Tuple[float, float]:
+        lat, lon = float(lat), float(lon)
+        if self.lat_step > 0.0:
+            lat = round(round(min(90.0, max(-90.0, lat)) / self.lat_step) * self.lat_step, 6)
+        if self.lon_step > 0.0:
+            lon = round(round((((lon + 180.0) % 360.0) - 180.0) / self.lon_step) * self.lon_step, 6)
+            if lon >= 180.0:
+                lon -= 360.0
+        return lat, lon
+
+
+def _grid_from_env(value: Optional[str]) -> WeatherGrid:
+    """``SMARTFARMING_WEATHER_GRID``: "lat_step,lon_step", one step for both, or 0 to disable."""
+    if not value:
+        return WeatherGrid()
+    steps = [float(part) for part in value.split(",")]
+    return WeatherGrid(steps[0], steps[-1])
+
+
+_weather_grid = _grid_from_env(os.environ.get("SMARTFARMING_WEATHER_GRID"))
+
+
+def get_weather_grid() -> WeatherGrid:
+    return _weather_grid
+
+
+def set_weather_grid(grid: Optional[WeatherGrid]) -> None:
+    """Swap the grid used to snap weather lookups; None restores the POWER grid."""
+    global _weather_grid
+    _weather_grid = grid or WeatherGrid()
+
+
+def snap_to_tile(lat: float, lon: float) -> Tuple[float, float]:
+    return _weather_grid.snap(lat, lon)
+
+
+class TileMemory:
+    """Bounded LRU of real POWER records per tile, shared by every session in the process.
+
+    Sits in front of the SQLite cache so players on the same tile skip its JSON decoding;
+    records are shared, so callers must copy before mutating (``_merge_weather`` does).
+    Each tile keeps at most ``max_days`` days, so a bulk import does not stay resident.
+    """
+    def __init__(self, max_tiles: int = TILE_MEMORY_TILES, max_days: int = TILE_MEMORY_DAYS) -> None:
+        self.max_tiles = max(1, int(max_tiles))
+        self.max_days = max(1, int(max_days))
+        self._tiles: "OrderedDict[Tuple[float, float], OrderedDict[str, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, tile: Tuple[float, float], day_strs: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            days = self._tiles.get(tile)
+            if days is None:
+                return {}
+            self._tiles.move_to_end(tile)
+            return {day_str: days[day_str] for day_str in day_strs if day_str in days}
+
+    def put_many(self, tile: Tuple[float, float], records: Dict[str, Dict[str, float]]) -> None:
+        if not records:
+            return
+        with self._lock:
+            days = self._tiles.get(tile)
+            if days is None:
+                days = self._tiles[tile] = OrderedDict()
+                while len(self._tiles) > self.max_tiles:
+                    self._tiles.popitem(last=False)
+            else:
+                self._tiles.move_to_end(tile)
+            for day_str, record in records.items():
+                days[day_str] = record
+                days.move_to_end(day_str)
+            while len(days) > self.max_days:
+                days.popitem(last=False)
+
+    def tiles(self) -> List[Tuple[float, float]]:
+        with self._lock:
+            return list(self._tiles)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+
+
+_tile_memory = TileMemory()
+
+
+def get_tile_memory() -> TileMemory:
+    return _tile_memory
+
+
+def set_tile_memory(memory: Optional[TileMemory]) -> None:
+    global _tile_memory
+    _tile_memory = memory or TileMemory()
+
+
+# ---------------------------------------------------------------------------
+# Weather prefetch
+# ---------------------------------------------------------------------------
+PREFETCH_WORKERS = int(os.environ.get("SMARTFARMING_PREFETCH_WORKERS", "4"))
+# Prefetch windows allowed to wait for a worker; further hints are dropped.
+PREFETCH_MAX_PENDING = 64
+
+Window = Tuple[str, str, Future]
+
+
+class WeatherPrefetcher:
+    """Warms the weather cache ahead of the simulation and coalesces concurrent POWER fetches.
+
+    ``fetch`` runs in the caller's thread and ``prefetch`` on a bounded worker pool. Both
+    register the (cell, start, end) window they are fetching, so a request for days already
+    being fetched for the same cell waits for that fetch instead of issuing its own.
+    """
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, max_pending: int = PREFETCH_MAX_PENDING) -> None:
+        self.workers = max(1, int(workers))
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[float, float], List[Window]] = {}
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _claim(self, cell: Tuple[float, float], start_str: str, end_str: str) -> Tuple[Future, bool]:
+        """Join an in-flight window covering [start, end], or register a new one (second item True)."""
+        with self._lock:
+            windows = self._inflight.setdefault(cell, [])
+            for window_start, window_end, future in windows:
+                if window_start <= start_str and end_str <= window_end:
+                    return future, False
+            future = Future()
+            windows.append((start_str, end_str, future))
+            return future, True
+
+    def _release(self, cell: Tuple[float, float], future: Future) -> None:
+        with self._lock:
+            windows = [window for window in self._inflight.get(cell, []) if window[2] is not future]
+            if windows:
+                self._inflight[cell] = windows
+            else:
+                self._inflight.pop(cell, None)
+
+    def _run(self, lat: float, lon: float, start_str: str, end_str: str, future: Future, skip_cached: bool) -> None:
+        """Fill ``future`` with every record available for the window (cached plus fetched)."""
+        cache = get_weather_cache()
+        try:
+            records: Dict[str, Dict[str, float]] = {}
+            fetch_start, fetch_end = start_str, end_str
+            if skip_cached:
+                start_day, _ = _normalise_day(start_str)
+                end_day, _ = _normalise_day(end_str)
+                day_strs = [(start_day + timedelta(days=offset)).strftime("%Y%m%d") for offset in range((end_day - start_day).days + 1)]
+                records = cache.get_many(lat, lon, day_strs)
+                missing = [day_str for day_str in day_strs if day_str not in records]
+                fetch_start, fetch_end = (missing[0], missing[-1]) if missing else (None, None)
+            if fetch_start is not None:
+                with METRICS.timer("weather_fetch_seconds", kind="prefetch" if skip_cached else "range"):
+                    fetched = _nasa_power_weather_range(lat, lon, fetch_start, fetch_end)
+                cache.put_many(lat, lon, fetched)
+                records.update(fetched)
+            get_tile_memory().put_many((lat, lon), records)
+            future.set_result(records)
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            self._release(cache.cell(lat, lon), future)
+
+    def fetch(self, lat: float, lon: float, start_str: str, end_str: str) -> Dict[str, Dict[str, float]]:
+        """Fetch [start, end] now, or wait for an in-flight fetch that already covers it.
+
+        ``lat``/``lon`` are expected to be tile coordinates (see snap_to_tile).
+        """
+        future, owner = self._claim(get_weather_cache().cell(lat, lon), start_str, end_str)
+        if owner:
+            self._run(lat, lon, start_str, end_str, future, skip_cached=False)
+        else:
+            METRICS.incr("weather_fetch_coalesced")
+        return future.result()
+
+    def prefetch(self, lat: float, lon: float, start: date | str, end: date | str) -> Optional[Future]:
+        """Queue [start, end] for the cache in the background; returns None when dropped."""
+        _, start_str = _normalise_day(start)
+        _, end_str = _normalise_day(end)
+        with self._lock:
+            full = self._pending >= self.max_pending
+        if full:
+            METRICS.incr("weather_prefetch_dropped")
+            return None
+        future, owner = self._claim(get_weather_cache().cell(lat, lon), start_str, end_str)
+        if not owner:
+            METRICS.incr("weather_fetch_coalesced")
+            return future
+        with self._lock:
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="weather-prefetch")
+            executor = self._executor
+        METRICS.incr("weather_prefetch_requests")
+        executor.submit(self._task, lat, lon, start_str, end_str, future)
+        return future
+
+    def _task(self, lat: float, lon: float, start_str: str, end_str: str, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._run(lat, lon, start_str, end_str, future, skip_cached=True)
+
+    def inflight(self) -> int:
+        with self._lock:
+            return sum(len(windows) for windows in self._inflight.values())
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_prefetcher: Optional[WeatherPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> WeatherPrefetcher:
+    """Return the process-wide prefetcher, creating it on first use."""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = WeatherPrefetcher()
+    return _prefetcher
+
+
+def set_prefetcher(prefetcher: Optional[WeatherPrefetcher]) -> None:
+    global _prefetcher
+    with _prefetcher_lock:
+        _prefetcher = prefetcher
+
+
+def prefetch_weather(lat: float, lon: float, start: date | str, end: date | str) -> Optional[Future]:
+    """Warm the weather cache for the tile holding (lat, lon) over [start, end] in the background."""
+    tile_lat, tile_lon = snap_to_tile(lat, lon)
+    return get_prefetcher().prefetch(tile_lat, tile_lon, start, end)
 
 
 def _synthetic_weather(lat: float, lon: float, day: date) -> Dict[str, float]:
     """Generate a deterministic synthetic weather profile when NASA POWER data is unavailable."""
     doy = day.timetuple().tm_yday
     phase = 2.0 * math.pi * (doy - 80) / 365.0
-    rnd = random.Random((hash((round(lat, 4), round(lon, 4), day.toordinal())) & 0xFFFFFFFF))
+    rnd = random.Random(_synthetic_seed(lat, lon, day.toordinal()))
 
     base_temp = 12.0 + 10.0 * math.sin(phase)
     diurnal_amp = 6.0 + 2.0 * math.cos(phase)
@@ -289,6 +871,183 @@ def _synthetic_weather(lat: float, lon: float, day: date) -> Dict[str, float]:
         "ET0": et0_cm,
     }
 
+# ---------------------------------------------------------------------------
+# Vectorised synthetic weather
+# ---------------------------------------------------------------------------
+SYNTHETIC_KEYS = ("IRRAD", "TMAX", "TMIN", "TEMP", "RAIN", "VAP", "WIND", "E0", "ES0", "ET0")
+# Below this many location-days the scalar generator is faster than one NumPy pass.
+SYNTHETIC_VECTOR_MIN = 256
+# Location-days per NumPy pass; bounds the (624, n) Mersenne Twister state to ~20 MB.
+SYNTHETIC_CHUNK = 8192
+
+# (low, high) of the rnd.uniform draws in _synthetic_weather, in draw order.
+_SYNTHETIC_DRAWS = (
+    (-1.0, 1.0),
+    (-1.0, 1.0),
+    (-1_000_000.0, 1_000_000.0),
+    (-0.3, 0.3),
+    (-1.0, 1.0),
+    (-0.5, 0.5),
+    (-0.05, 0.05),
+)
+
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MT_N = 624
+_MT_M = 397
+_mt_initial: Optional[List[int]] = None
+_season_trig: Optional[List[Tuple[float, float, float]]] = None
+
+
+def _synthetic_seed(lat: float, lon: float, ordinal: int) -> int:
+    # Inlined in synthetic_weather_grid; the two must stay identical.
+    return hash((round(lat, 4), round(lon, 4), ordinal)) & 0xFFFFFFFF
+
+
+def _mt_initial_state() -> List[int]:
+    """CPython's init_genrand(19650218), the starting point of every init_by_array seeding."""
+    global _mt_initial
+    if _mt_initial is None:
+        state = [19650218]
+        for index in range(1, _MT_N):
+            previous = state[-1]
+            state.append((1812433253 * (previous ^ (previous >> 30)) + index) & 0xFFFFFFFF)
+        _mt_initial = state
+    return _mt_initial
+
+
+def _mt_outputs(seeds, count: int):
+    """First ``count`` 32-bit outputs of ``random.Random(seed)`` for each 32-bit seed.
+
+    Replays CPython's init_by_array (a one-word key) on a (624, n) uint32 state, one row
+    per step, then twists and tempers only the words needed. Returns a (count, n) array.
+    """
+    n = len(seeds)
+    key = _np.asarray(seeds, dtype=_np.uint32)
+    initial = _np.asarray(_mt_initial_state(), dtype=_np.uint32)
+    mt = _np.empty((_MT_N, n), dtype=_np.uint32)
+    scratch = _np.empty(n, dtype=_np.uint32)
+
+    def mix(row: int, previous, multiplier: int, base) -> None:
+        _np.right_shift(previous, 30, out=scratch)
+        _np.bitwise_xor(scratch, previous, out=scratch)
+        _np.multiply(scratch, _np.uint32(multiplier), out=scratch)
+        _np.bitwise_xor(scratch, base, out=mt[row])
+
+    mt[0] = initial[0]
+    for row in range(1, _MT_N):
+        mix(row, mt[row - 1], 1664525, initial[row])
+        mt[row] += key
+    mt[0] = mt[_MT_N - 1]
+    mix(1, mt[0], 1664525, mt[1])
+    mt[1] += key
+    for row in range(2, _MT_N):
+        mix(row, mt[row - 1], 1566083941, mt[row])
+        mt[row] -= _np.uint32(row)
+    mt[0] = mt[_MT_N - 1]
+    mix(1, mt[0], 1566083941, mt[1])
+    mt[1] -= _np.uint32(1)
+    mt[0] = 0x80000000
+
+    y = (mt[:count] & _np.uint32(0x80000000)) | (mt[1:count + 1] & _np.uint32(0x7FFFFFFF))
+    words = mt[_MT_M:_MT_M + count] ^ (y >> 1) ^ _np.where(y & 1, _np.uint32(0x9908B0DF), _np.uint32(0))
+    words ^= words >> 11
+    words ^= (words << 7) & _np.uint32(0x9D2C5680)
+    words ^= (words << 15) & _np.uint32(0xEFC60000)
+    words ^= words >> 18
+    return words
+
+
+def _seasonal_trig() -> List[Tuple[float, float, float]]:
+    """sin(phase), cos(phase) and sin(phase - pi/3) for day-of-year 0..366, via math as in the scalar path."""
+    global _season_trig
+    if _season_trig is None:
+        table = []
+        for doy in range(367):
+            phase = 2.0 * math.pi * (doy - 80) / 365.0
+            table.append((math.sin(phase), math.cos(phase), math.sin(phase - math.pi / 3.0)))
+        _season_trig = table
+    return _season_trig
+
+
+def _synthetic_columns(seeds, doys):
+    """Vectorised body of _synthetic_weather for flat per-sample seeds and day-of-year values."""
+    words = _mt_outputs(seeds, 2 * len(_SYNTHETIC_DRAWS))
+    draws = []
+    for index, (low, high) in enumerate(_SYNTHETIC_DRAWS):
+        # random.random(): 53 bits from two words; uniform(a, b) = a + (b - a) * random().
+        high_bits = (words[2 * index] >> 5).astype(_np.float64)
+        unit = (high_bits * 67108864.0 + (words[2 * index + 1] >> 6)) * (1.0 / 9007199254740992.0)
+        draws.append(low + (high - low) * unit)
+    trig = _np.asarray(_seasonal_trig())[doys]
+    sin_phase, cos_phase, sin_rain = trig[:, 0], trig[:, 1], trig[:, 2]
+
+    base_temp = 12.0 + 10.0 * sin_phase
+    diurnal_amp = 6.0 + 2.0 * cos_phase
+    tmax = base_temp + diurnal_amp + draws[0]
+    tmin = base_temp - diurnal_amp + draws[1]
+    irr = _np.maximum(6_000_000.0, 16_000_000.0 + 6_000_000.0 * sin_phase + draws[2])
+    rain = _np.maximum(0.0, 0.8 * (1.0 + sin_rain) + draws[3]) * 0.8
+    vap = 8.0 + 6.0 * (1.0 - sin_phase) + draws[4]
+    wind = 2.0 + 0.5 * cos_phase + draws[5]
+    et0 = _np.maximum(0.0, 0.35 + 0.25 * sin_phase + draws[6])
+    return {
+        "IRRAD": irr,
+        "TMAX": tmax,
+        "TMIN": tmin,
+        "TEMP": 0.5 * (tmax + tmin),
+        "RAIN": rain,
+        "VAP": _np.maximum(0.0, vap),
+        "WIND": _np.maximum(0.0, wind),
+        "E0": et0,
+        "ES0": et0,
+        "ET0": et0,
+    }
+
+
+def synthetic_weather_grid(locations: Sequence[Tuple[float, float]], days: Sequence[date]) -> Dict[str, object]:
+    """Synthetic weather for every (location, day) pair as ``(len(locations), len(days))`` float64 arrays.
+
+    Values equal ``_synthetic_weather`` exactly (same per-(lat, lon, day) seeds and draws);
+    one NumPy pass covers the whole grid. Requires NumPy.
+    """
+    if _np is None:
+        raise RuntimeError("synthetic_weather_grid requires NumPy.")
+    ordinals = [day.toordinal() for day in days]
+    calendar = _np.asarray(ordinals, dtype=_np.int64) - _UNIX_EPOCH_ORDINAL
+    calendar = calendar.astype("datetime64[D]")
+    doys = (calendar - calendar.astype("datetime64[Y]")).astype(_np.int64) + 1
+    seeds: List[int] = []
+    for lat, lon in locations:
+        rounded_lat, rounded_lon = round(lat, 4), round(lon, 4)
+        seeds.extend(hash((rounded_lat, rounded_lon, ordinal)) & 0xFFFFFFFF for ordinal in ordinals)
+    flat_doys = _np.tile(doys, len(locations))
+    parts = [
+        _synthetic_columns(seeds[offset:offset + SYNTHETIC_CHUNK], flat_doys[offset:offset + SYNTHETIC_CHUNK])
+        for offset in range(0, len(seeds), SYNTHETIC_CHUNK)
+    ]
+    shape = (len(locations), len(days))
+    if not parts:
+        return {key: _np.empty(shape) for key in SYNTHETIC_KEYS}
+    return {key: _np.concatenate([part[key] for part in parts]).reshape(shape) for key in SYNTHETIC_KEYS}
+
+
+def synthetic_weather_days(lat: float, lon: float, days: Sequence[date]) -> List[Dict[str, float]]:
+    """``_synthetic_weather`` for each day, vectorised when NumPy is installed and the batch is large."""
+    if _np is None or len(days) < SYNTHETIC_VECTOR_MIN:
+        return [_synthetic_weather(lat, lon, day) for day in days]
+    grid = synthetic_weather_grid([(lat, lon)], days)
+    columns = [grid[key][0].tolist() for key in SYNTHETIC_KEYS]
+    return [dict(zip(SYNTHETIC_KEYS, values)) for values in zip(*columns)]
+
+
+def synthetic_weather_range(lat: float, lon: float, start: date | str, end: date | str) -> List[Dict[str, float]]:
+    """Synthetic records for every day in [start, end]; see synthetic_weather_days."""
+    start_day, _ = _normalise_day(start)
+    end_day, _ = _normalise_day(end)
+    days = [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+    return synthetic_weather_days(lat, lon, days)
+
+
 def _merge_weather(record: Optional[Dict[str, float]]) -> Dict[str, float]:
     merged = dict(_DEFAULT_WEATHER)
     if record:
@@ -311,17 +1070,280 @@ def _merge_weather(record: Optional[Dict[str, float]]) -> Dict[str, float]:
 
 
 
+def _tile_lookup(tile: Tuple[float, float], day_strs: List[str]) -> Dict[str, Dict[str, float]]:
+    """Records for ``day_strs`` from the in-process tile tier, then the SQLite cache."""
+    memory = get_tile_memory()
+    known = memory.get_many(tile, day_strs)
+    METRICS.incr("weather_tile_hits", len(known))
+    remaining = [day_str for day_str in day_strs if day_str not in known]
+    if remaining:
+        stored = get_weather_cache().get_many(tile[0], tile[1], remaining)
+        METRICS.incr("weather_cache_hits", len(stored))
+        memory.put_many(tile, stored)
+        known.update(stored)
+    return known
+
+
 def get_weather(lat: float, lon: float, day: date | str) -> Dict[str, float]:
-    """Return a PCSE-compatible weather record for the given day."""
+    """Return a PCSE-compatible weather record for the given day from the tile holding (lat, lon)."""
     day_obj, day_str = _normalise_day(day)
-    record = _nasa_power_weather(lat, lon, day_str)
+    tile = snap_to_tile(lat, lon)
+    record = _tile_lookup(tile, [day_str]).get(day_str)
     if record is None:
-        record = _synthetic_weather(lat, lon, day_obj)
+        METRICS.incr("weather_cache_misses")
+        with METRICS.timer("weather_fetch_seconds", kind="day"):
+            record = _nasa_power_weather(tile[0], tile[1], day_str)
+        if record is not None:
+            get_weather_cache().put(tile[0], tile[1], day_str, record)
+            get_tile_memory().put_many(tile, {day_str: record})
+    if record is None:
+        METRICS.incr("weather_synthetic_days")
+        record = _synthetic_weather(tile[0], tile[1], day_obj)
     merged = _merge_weather(record)
     merged["DAY"] = day_obj
     return merged
 
 
+def get_weather_range(lat: float, lon: float, start: date | str, end: date | str) -> List[Dict[str, float]]:
+    """Return PCSE-compatible weather records for every day in [start, end] using one POWER request.
+
+    (lat, lon) is snapped to its POWER tile, so every session on a tile shares the fetch and
+    the cached records. Days already cached are not fetched again. Days missing from the
+    POWER response fall back to synthetic weather for the tile, exactly as in get_weather.
+    """
+    start_day, start_str = _normalise_day(start)
+    end_day, end_str = _normalise_day(end)
+    if end_day < start_day:
+        raise ValueError("End date must not precede start date")
+    day_strs = [(start_day + timedelta(days=offset)).strftime("%Y%m%d")
+                for offset in range((end_day - start_day).days + 1)]
+    tile_lat, tile_lon = snap_to_tile(lat, lon)
+    known = _tile_lookup((tile_lat, tile_lon), day_strs)
+    missing = [day_str for day_str in day_strs if day_str not in known]
+    METRICS.incr("weather_cache_misses", len(missing))
+    if missing:
+        # One request spanning the gap (shared with any in-flight fetch covering it);
+        # cached days inside it are simply refreshed.
+        known.update(get_prefetcher().fetch(tile_lat, tile_lon, missing[0], missing[-1]))
+    gaps = [(start_day + timedelta(days=offset), day_str) for offset, day_str in enumerate(day_strs) if day_str not in known]
+    if gaps:
+        METRICS.incr("weather_synthetic_days", len(gaps))
+        synthetic = synthetic_weather_days(tile_lat, tile_lon, [day for day, _ in gaps])
+        known.update(zip((day_str for _, day_str in gaps), synthetic))
+    records: List[Dict[str, float]] = []
+    day_obj = start_day
+    while day_obj <= end_day:
+        record = known[day_obj.strftime("%Y%m%d")]
+        merged = _merge_weather(record)
+        merged["DAY"] = day_obj
+        records.append(merged)
+        day_obj += timedelta(days=1)
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Offline bulk import
+# ---------------------------------------------------------------------------
+POWER_COLUMNS = tuple(_POWER_PARAMETERS.split(","))
+IMPORT_FORMATS = ("json", "csv", "netcdf")
+
+# (tile lat, tile lon, YYYYMMDD days, POWER-named columns in POWER units)
+WeatherBlock = Tuple[float, float, List[str], Dict[str, Any]]
+
+
+def _power_column(columns: Dict[str, Any], name: str, rows: int):
+    """One POWER column as float64 with missing and fill values as NaN."""
+    values = columns.get(name)
+    if values is None:
+        return _np.full(rows, _np.nan)
+    if isinstance(values, _np.ndarray):
+        array = values.astype(_np.float64)
+    else:
+        array = _np.array([_np.nan if value is None or value == "" else value for value in values], dtype=_np.float64)
+    array[array == _POWER_FILL_VALUE] = _np.nan
+    return array
+
+
+def convert_power_columns(day_strs: Sequence[str], columns: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """``_convert_power_record`` for every day of a file at once, keyed by YYYYMMDD.
+
+    Same conversions (kWh/m2 -> J/m2, mm -> cm, VAP from QV2M/PS, snow below 0 degC TMAX) and
+    the same output records, computed column-wise with NumPy; falls back to the per-day
+    converter without NumPy.
+    """
+    if _np is None:
+        payload = {name: dict(zip(day_strs, (None if value == "" else value for value in values))) for name, values in columns.items()}
+        converted = ((day_str, _convert_power_record(payload, day_str)) for day_str in day_strs)
+        return {day_str: record for day_str, record in converted if record is not None}
+    rows = len(day_strs)
+    irr, tmax, tmin, rain, qv2m, ps, wind, et0 = (_power_column(columns, name, rows) for name in POWER_COLUMNS)
+    irr = irr * 3_600_000.0
+    temp = 0.5 * (tmax + tmin)
+    rain_cm = rain / 10.0
+    q = qv2m / 1000.0
+    vap = (q * ps) / (0.622 + 0.378 * q) * 10.0
+    et0_cm = et0 / 10.0
+    frozen = tmax <= 0.0
+    snow_cm = _np.where(frozen & ~_np.isnan(rain_cm), rain_cm, _np.nan)
+    rain_cm = _np.where(frozen & ~_np.isnan(rain_cm), 0.0, rain_cm)
+    valid = ~(_np.isnan(irr) & _np.isnan(tmax) & _np.isnan(rain))
+
+    def values(array) -> List[Optional[float]]:
+        return [None if value != value else value for value in array.tolist()]
+    fields = {
+        "IRRAD": values(irr), "TMAX": values(tmax), "TMIN": values(tmin), "TEMP": values(temp),
+        "RAIN": values(rain_cm), "SNOW": values(snow_cm), "VAP": values(vap), "WIND": values(wind),
+    }
+    evap = values(et0_cm)
+    names = list(fields)
+    records: Dict[str, Dict[str, float]] = {}
+    for index in _np.flatnonzero(valid).tolist():
+        record = {name: fields[name][index] for name in names}
+        record["E0"] = record["ES0"] = record["ET0"] = evap[index]
+        records[day_strs[index]] = record
+    return records
+
+
+def read_power_json(path: str) -> List[WeatherBlock]:
+    """POWER API JSON: a single-point Feature or a regional FeatureCollection."""
+    with open(path, "r", encoding="utf-8") as handle:
+        document = json.load(handle)
+    features = document.get("features") or [document]
+    blocks: List[WeatherBlock] = []
+    for feature in features:
+        coordinates = (feature.get("geometry") or {}).get("coordinates") or [None, None]
+        parameters = feature["properties"]["parameter"]
+        day_strs = sorted({day_str for series in parameters.values() for day_str in series})
+        columns = {name: [series.get(day_str) for day_str in day_strs] for name, series in parameters.items()}
+        blocks.append((coordinates[1], coordinates[0], day_strs, columns))
+    return blocks
+
+
+def _csv_day_strs(header: List[str], rows: List[List[str]]) -> List[str]:
+    index = {name: position for position, name in enumerate(header)}
+    if {"YEAR", "MO", "DY"} <= index.keys():
+        year, month, day = index["YEAR"], index["MO"], index["DY"]
+        return ["%04d%02d%02d" % (int(row[year]), int(row[month]), int(row[day])) for row in rows]
+    if {"YEAR", "DOY"} <= index.keys():
+        year, doy = index["YEAR"], index["DOY"]
+        return [(date(int(row[year]), 1, 1) + timedelta(days=int(row[doy]) - 1)).strftime("%Y%m%d") for row in rows]
+    if "DATE" in index:
+        return [_normalise_day(row[index["DATE"]])[1] for row in rows]
+    raise ValueError("CSV needs YEAR,MO,DY or YEAR,DOY or DATE columns.")
+
+
+def read_power_csv(path: str, lat: Optional[float] = None, lon: Optional[float] = None,
+                   rename: Optional[Dict[str, str]] = None) -> List[WeatherBlock]:
+    """POWER CSV export (point or regional) or a station CSV with POWER-named columns.
+
+    The ``-BEGIN HEADER-`` block is skipped (its ``Location:`` line supplies the point);
+    ``rename`` maps station column names onto POWER names (e.g. ``{"tmax": "T2M_MAX"}``).
+    """
+    rename = {key.upper(): value.upper() for key, value in (rename or {}).items()}
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        lines = iter(handle)
+        header_line = next(lines, "")
+        if header_line.startswith("-BEGIN HEADER-"):
+            for line in lines:
+                if line.startswith("-END HEADER-"):
+                    break
+                if line.startswith("Location:") and lat is None:
+                    parts = line.replace(":", " ").split()
+                    lat = float(parts[parts.index("Latitude") + 1])
+                    lon = float(parts[parts.index("Longitude") + 1])
+            header_line = next(lines, "")
+        header = [rename.get(name.strip().upper(), name.strip().upper()) for name in next(csv.reader([header_line]))]
+        rows = [row for row in csv.reader(lines) if row]
+    day_strs = _csv_day_strs(header, rows)
+    index = {name: position for position, name in enumerate(header)}
+    if "LAT" in index and "LON" in index:
+        points: Dict[Tuple[float, float], List[int]] = {}
+        for position, row in enumerate(rows):
+            points.setdefault((float(row[index["LAT"]]), float(row[index["LON"]])), []).append(position)
+    elif lat is not None and lon is not None:
+        points = {(float(lat), float(lon)): list(range(len(rows)))}
+    else:
+        raise ValueError(f"{path}: no location; pass lat/lon or include LAT,LON columns.")
+    blocks: List[WeatherBlock] = []
+    for (point_lat, point_lon), positions in points.items():
+        columns = {name: [rows[position][index[name]] for position in positions] for name in POWER_COLUMNS if name in index}
+        blocks.append((point_lat, point_lon, [day_strs[position] for position in positions], columns))
+    return blocks
+
+
+def read_weather_netcdf(path: str, rename: Optional[Dict[str, str]] = None) -> List[WeatherBlock]:
+    """NetCDF with POWER-named variables over (time, lat, lon); needs the optional ``xarray``."""
+    if _xr is None:
+        raise RuntimeError("NetCDF import requires the optional 'xarray' package.")
+    with _xr.open_dataset(path) as dataset:
+        if rename:
+            dataset = dataset.rename({key: value for key, value in rename.items() if key in dataset.variables})
+        time_name = next(name for name in ("time", "TIME", "date") if name in dataset.coords)
+        lat_name = next(name for name in ("lat", "latitude", "LAT") if name in dataset.coords)
+        lon_name = next(name for name in ("lon", "longitude", "LON") if name in dataset.coords)
+        day_strs = [str(value)[:10].replace("-", "") for value in dataset[time_name].values.astype("datetime64[D]")]
+        blocks: List[WeatherBlock] = []
+        for point_lat in _np.atleast_1d(dataset[lat_name].values).tolist():
+            for point_lon in _np.atleast_1d(dataset[lon_name].values).tolist():
+                point = dataset.sel({lat_name: point_lat, lon_name: point_lon})
+                columns = {name: point[name].values.astype(_np.float64) for name in POWER_COLUMNS if name in point}
+                blocks.append((point_lat, point_lon, day_strs, columns))
+    return blocks
+
+
+def _detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in {".nc", ".nc4", ".netcdf"}:
+        return "netcdf"
+    if extension == ".csv":
+        return "csv"
+    return "json"
+
+
+def import_weather_files(paths: Iterable[str], lat: Optional[float] = None, lon: Optional[float] = None,
+                         fmt: Optional[str] = None, rename: Optional[Dict[str, str]] = None,
+                         cache: Optional[WeatherCache] = None) -> Dict[str, int]:
+    """Load POWER JSON/CSV (or NetCDF) dumps into the weather cache, snapped to POWER tiles.
+
+    Imported days are treated as real POWER data, so lookups on those tiles no longer fall
+    back to synthetic weather. Every file is read before anything is written, and the
+    rows go in as one transaction, so a failed import leaves the cache untouched. Returns
+    file, tile and day counts.
+    """
+    default_cache = cache is None or cache is get_weather_cache()
+    cache = cache or get_weather_cache()
+    summary = {"files": 0, "tiles": 0, "days": 0, "skipped_days": 0}
+    batches: List[Tuple[Tuple[float, float], Dict[str, Dict[str, float]]]] = []
+    for path in paths:
+        kind = fmt or _detect_format(path)
+        if kind == "csv":
+            blocks = read_power_csv(path, lat, lon, rename)
+        elif kind == "netcdf":
+            blocks = read_weather_netcdf(path, rename)
+        elif kind == "json":
+            blocks = read_power_json(path)
+        else:
+            raise ValueError(f"Unsupported import format: {kind}")
+        for block_lat, block_lon, day_strs, columns in blocks:
+            if block_lat is None or block_lon is None:
+                if lat is None or lon is None:
+                    raise ValueError(f"{path}: no location; pass lat/lon.")
+                block_lat, block_lon = lat, lon
+            records = convert_power_columns(day_strs, columns)
+            batches.append((snap_to_tile(block_lat, block_lon), records))
+            summary["days"] += len(records)
+            summary["skipped_days"] += len(day_strs) - len(records)
+        summary["files"] += 1
+    cache.import_many((tile[0], tile[1], records) for tile, records in batches)
+    if default_cache:
+        # The tile memory fronts the default cache only; a caller's own cache stays private.
+        memory = get_tile_memory()
+        for tile, records in batches:
+            memory.put_many(tile, records)
+    summary["tiles"] = len({tile for tile, _ in batches})
+    return summary
+
+
 def predict_weather(weather_data: Optional[Dict[str, float]]) -> Optional[List[str]]:
     if not weather_data:
         return None
@@ -368,7 +1390,7 @@ def predict_weather(weather_data: Optional[Dict[str, float]]) -> Optional[List[s
     return ordered_predictions
 
 
-if __name__ == "__main__":  # pragma: no cover
+def _demo() -> None:
     print("Soil profile cheque:")
     print(get_soil_profile()["SoilProfileDescription"]["SoilLayers"][0])
 
@@ -379,3 +1401,33 @@ if __name__ == "__main__":  # pragma: no cover
     w = get_weather(49.104, -122.66, today)
     print("Weather record:", w)
     print("Forecast tags:", predict_weather(w))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="SMARTFarming weather data tools")
+    commands = parser.add_subparsers(dest="command")
+    importer = commands.add_parser("import", help="bulk-load POWER JSON/CSV (or NetCDF) dumps into the weather cache")
+    importer.add_argument("files", nargs="+")
+    importer.add_argument("--format", choices=IMPORT_FORMATS, help="default: from the file extension")
+    importer.add_argument("--lat", type=float, help="location for files that do not carry one")
+    importer.add_argument("--lon", type=float)
+    importer.add_argument("--map", action="append", default=[], metavar="SRC=POWER_NAME",
+                          help="rename a station column to a POWER parameter (repeatable)")
+    importer.add_argument("--cache", default=WEATHER_CACHE_PATH, help="weather cache path")
+    args = parser.parse_args(argv)
+    if args.command != "import":
+        _demo()
+        return
+    rename = dict(item.split("=", 1) for item in args.map)
+    cache = WeatherCache(args.cache)
+    started = time.perf_counter()
+    try:
+        summary = import_weather_files(args.files, args.lat, args.lon, args.format, rename, cache)
+    finally:
+        cache.close()
+    print(f"imported {summary['days']} days for {summary['tiles']} tiles from {summary['files']} files "
+          f"({summary['skipped_days']} empty days skipped) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
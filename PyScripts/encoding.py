@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import array
+import json
+import os
+import sys
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Type
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    _orjson = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:  # pragma: no cover - msgspec is optional
+    _msgspec = None
+
+try:
+    import msgpack as _msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    _msgpack = None
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - numpy is optional
+    _np = None
+
+# Fastest first; "auto" picks the first one that is installed.
+ENCODER_PREFERENCE = ("orjson", "msgspec", "json")
+ENCODER_ENV = "SMARTFARMING_JSON_ENCODER"
+
+Default = Callable[[Any], Any]
+
+# MessagePack extension type carrying a float array as raw little-endian float64 bytes.
+FLOAT64_ARRAY_EXT = 1
+# Float lists shorter than this stay ordinary MessagePack arrays.
+FLOAT_ARRAY_MIN = 8
+
+
+class JsonEncoder:
+    """Standard-library encoder; ``default`` handles anything json cannot serialise itself."""
+    name = "json"
+
+    def __init__(self, default: Optional[Default] = None) -> None:
+        self.default = default
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=self.default).encode("utf-8")
+
+
+class OrjsonEncoder(JsonEncoder):
+    """orjson with native numpy arrays and scalars; dates are written as ISO strings."""
+    name = "orjson"
+
+    def __init__(self, default: Optional[Default] = None) -> None:
+        super().__init__(default)
+        self._options = _orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return _orjson.dumps(obj, default=self.default, option=self._options)
+
+
+class MsgspecEncoder(JsonEncoder):
+    """msgspec's JSON encoder; numpy values go through ``default``."""
+    name = "msgspec"
+
+    def __init__(self, default: Optional[Default] = None) -> None:
+        super().__init__(default)
+        self._encoder = _msgspec.json.Encoder(enc_hook=default)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+_ENCODERS: Dict[str, Type[JsonEncoder]] = {
+    "orjson": OrjsonEncoder,
+    "msgspec": MsgspecEncoder,
+    "json": JsonEncoder,
+}
+_INSTALLED = {"orjson": _orjson is not None, "msgspec": _msgspec is not None, "json": True}
+
+
+def available_encoders() -> List[str]:
+    return [name for name in ENCODER_PREFERENCE if _INSTALLED[name]]
+
+
+def make_encoder(name: Optional[str] = None, default: Optional[Default] = None) -> JsonEncoder:
+    """Build the named encoder, or (for ``None``/``"auto"``) the env override or fastest installed."""
+    name = (name or os.environ.get(ENCODER_ENV) or "auto").lower()
+    if name == "auto":
+        name = available_encoders()[0]
+    if name not in _ENCODERS:
+        raise ValueError(f"Unknown JSON encoder '{name}'. Choose from: auto, {', '.join(ENCODER_PREFERENCE)}")
+    if not _INSTALLED[name]:
+        raise RuntimeError(f"JSON encoder '{name}' is not installed.")
+    return _ENCODERS[name](default)
+
+
+def msgpack_available() -> bool:
+    return _msgpack is not None
+
+
+def _float_buffer(values: Any) -> bytes:
+    buffer = array.array("d", values)
+    if sys.byteorder == "big":
+        buffer.byteswap()
+    return buffer.tobytes()
+
+
+def _pack_floats(obj: Any) -> Any:
+    """Replace float lists (and 1-D float numpy arrays) with FLOAT64_ARRAY_EXT buffers."""
+    if isinstance(obj, dict):
+        return {key: _pack_floats(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if len(obj) >= FLOAT_ARRAY_MIN and all(type(item) is float for item in obj):
+            return _msgpack.ExtType(FLOAT64_ARRAY_EXT, _float_buffer(obj))
+        return [_pack_floats(item) for item in obj]
+    if _np is not None and isinstance(obj, _np.ndarray) and obj.ndim == 1 and obj.dtype.kind == "f":
+        return _msgpack.ExtType(FLOAT64_ARRAY_EXT, obj.astype("<f8", copy=False).tobytes())
+    return obj
+
+
+def pack_msgpack(obj: Any, default: Optional[Default] = None) -> bytes:
+    """Encode ``obj`` as MessagePack with float arrays sent as raw little-endian buffers."""
+    def hook(value: Any) -> Any:
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if _np is not None and isinstance(value, _np.generic):
+            return value.item()
+        if default is not None:
+            return _pack_floats(default(value))
+        raise TypeError(f"Cannot serialise {type(value).__name__}")
+    return _msgpack.packb(_pack_floats(obj), default=hook, use_bin_type=True)
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    if code == FLOAT64_ARRAY_EXT:
+        values = array.array("d")
+        values.frombytes(data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+    return _msgpack.ExtType(code, data)
+
+
+def unpack_msgpack(data: bytes) -> Any:
+    """Decode MessagePack, turning FLOAT64_ARRAY_EXT buffers back into float lists."""
+    return _msgpack.unpackb(data, raw=False, ext_hook=_unpack_ext)
@@ -1,34 +1,94 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
+import copy
+import functools
+import hashlib
+import hmac
+import heapq
+import io
+import itertools
 import json
+import logging
+import logging.handlers
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import random
+import re
+import secrets
 import socket
+import struct
 import threading
+import time
+import uuid
+import zlib
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 from difflib import get_close_matches
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from types import FunctionType, GeneratorType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import numpy as _np
 except ImportError:
     _np = None
 
+import pcse
 from pcse import signals
 from pcse.base import ParameterProvider, WeatherDataContainer, WeatherDataProvider
+from pcse.base.dispatcher import dispatcher as _dispatcher
+from pcse.base.states_rates import StatesRatesCommon
+from pcse.base.variablekiosk import VariableKiosk
+from pcse.decorators import descript as _descript
+from pcse.traitlets import All as _ALL_TRAIT_EVENTS
 from pcse.input import WOFOST81SiteDataProvider_SNOMIN, YAMLCropDataProvider
 from pcse.models import Wofost81_NWLP_MLWB_SNOMIN
 
-from data import get_soil_profile, get_site_parameters, get_weather, predict_weather
+# Snapshots, forks and checkpoints (_EnginePickler, _rebind_kiosk, _rewire_signals) depend on pcse
+# internals: the VariableKiosk registries, traitlets descriptors and dispatcher wiring. Only
+# versions that tests/test_engine_fork.py has passed on are accepted.
+VERIFIED_PCSE_VERSIONS = ("6.0.13",)
+UNVERIFIED_PCSE_ENV = "SMARTFARMING_ALLOW_UNVERIFIED_PCSE"
+if pcse.__version__ not in VERIFIED_PCSE_VERSIONS and os.environ.get(UNVERIFIED_PCSE_ENV) != "1":
+    raise ImportError(
+        f"pcse {pcse.__version__} is not verified for engine snapshots (verified: {', '.join(VERIFIED_PCSE_VERSIONS)}). "
+        f"Run tests/test_engine_fork.py and add it to VERIFIED_PCSE_VERSIONS, or set {UNVERIFIED_PCSE_ENV}=1."
+    )
+
+from data import FrozenParameters, get_site_cache, get_soil_profile, get_site_parameters, get_weather_cache, get_weather_range, predict_weather, prefetch_weather
+from encoding import FLOAT64_ARRAY_EXT, JsonEncoder, make_encoder, msgpack_available, pack_msgpack, unpack_msgpack
+from metrics import METRICS
+from recorder import SERIES_FORMATS, SeriesRecorder, scalar_variables
 
 ModelType = Wofost81_NWLP_MLWB_SNOMIN
 
+logger = logging.getLogger("smartfarming")
+
 class GameWeatherProvider(WeatherDataProvider):
     """Simple in-memory weather provider backed by data.py helpers."""
+    # Last stored day and end of the window already handed to the background prefetcher
+    # (class defaults so providers pickled before these existed still load).
+    horizon: Optional[date] = None
+    _prefetched_until: Optional[date] = None
+    # Look-ahead prefetch is for open-ended sessions; bounded runs set ``prefetch`` off or
+    # give the last day they can reach in ``season_end``.
+    prefetch = True
+    season_end: Optional[date] = None
     def __init__(self, lat: float, lon: float, elev: float, seed_record: Dict) -> None:
         super().__init__()
         self.latitude = lat
         self.longitude = lon
         self.elevation = elev
         self._site = {"LAT": lat, "LON": lon, "ELEV": elev}
+        # Raw merged records and their forecast tags, indexed once per day at ingest.
+        self.records: Dict[date, Dict] = {}
+        self.forecasts: Dict[date, Optional[List[str]]] = {}
+        self._shared = False
         self.add_record(seed_record)
     def _to_container(self, record: Dict) -> WeatherDataContainer:
         payload = dict(self._site)
@@ -46,66 +106,554 @@ class GameWeatherProvider(WeatherDataProvider):
         payload.update(item)
         return WeatherDataContainer(**payload)
     def add_record(self, record: Dict) -> None:
+        if self._shared:
+            # Copy-on-write: detach from the stores shared with a fork before the first write.
+            self.store = dict(self.store)
+            self.records = dict(self.records)
+            self.forecasts = dict(self.forecasts)
+            self._shared = False
         container = self._to_container(record)
         self._store_WeatherDataContainer(container, container.DAY)
+        raw = dict(record)
+        raw["DAY"] = container.DAY
+        self.records[container.DAY] = raw
+        if self.horizon is None or container.DAY > self.horizon:
+            self.horizon = container.DAY
+        self.forecasts[container.DAY] = predict_weather(raw)
+    def prefill(self, start: date, end: date) -> None:
+        """Fetch [start, end] in one range request and store every day not yet present."""
+        for record in get_weather_range(self.latitude, self.longitude, start, end):
+            if (self.check_keydate(record["DAY"]), 0) not in self.store:
+                self.add_record(record)
     def ensure_day(self, day: date) -> None:
         key = (self.check_keydate(day), 0)
         if key not in self.store:
-            self.add_record(get_weather(self.latitude, self.longitude, day))
+            # Ran past the prefilled season: fetch the next chunk in one go rather than day by day.
+            self.prefill(day, day + timedelta(days=WEATHER_CHUNK_DAYS))
+        self._prefetch_ahead(key[0])
+    def _prefetch_ahead(self, day: date) -> None:
+        """Warm the cache for the next chunk once the cursor is within PREFETCH_AHEAD_DAYS of the end."""
+        if not self.prefetch:
+            return
+        if self.horizon is None:
+            self.horizon = max(self.records)
+        if self.season_end is not None and self.season_end <= self.horizon:
+            return
+        until = max(self.horizon, self._prefetched_until or self.horizon)
+        if (until - day).days > PREFETCH_AHEAD_DAYS:
+            return
+        # Same window ensure_day would prefill once the cursor passes ``until``.
+        self._prefetched_until = until + timedelta(days=1 + WEATHER_CHUNK_DAYS)
+        prefetch_weather(self.latitude, self.longitude, until + timedelta(days=1), self._prefetched_until)
+    def record_for(self, day: date) -> Tuple[Optional[Dict], Optional[List[str]]]:
+        """Return the raw weather record and forecast tags for ``day`` without refetching."""
+        day = self.check_keydate(day)
+        if day not in self.records:
+            self.ensure_day(day)
+        return self.records.get(day), self.forecasts.get(day)
+    def fork(self) -> "GameWeatherProvider":
+        """Return a provider sharing this one's records until either side adds a day."""
+        clone = copy.copy(self)
+        self._shared = True
+        clone._shared = True
+        return clone
     def __call__(self, day, member_id: int = 0):
         self.ensure_day(day)
         return super().__call__(day, member_id)
 
+class _EnginePickler(pickle.Pickler):
+    """Pickler for a WOFOST engine graph.
+
+    pcse's prepare_rates/prepare_states descriptors cache a closure on each instance the
+    first time a method is called; those closures are rebuilt by attribute lookup on load.
+    Objects whose id is in ``shared`` are written by reference instead of being copied
+    (via reducer_override rather than persistent_id, which pickle calls for every float).
+    States/rates objects met along the way are collected in ``templates`` because the kiosk
+    identifies them by id().
+    """
+    def __init__(self, file, shared: Dict[int, str]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shared = shared
+        self.templates: Dict[int, StatesRatesCommon] = {}
+    def reducer_override(self, obj):
+        key = self._shared.get(id(obj))
+        if key is not None:
+            return _shared_ref, (key,)
+        if isinstance(obj, StatesRatesCommon):
+            self.templates[id(obj)] = obj
+            return NotImplemented
+        if type(obj) is VariableKiosk:
+            # The kiosk is a dict that rejects item assignment, so restore its items directly.
+            return VariableKiosk.__new__, (VariableKiosk,), (dict(obj), obj.__dict__), None, None, _restore_kiosk
+        if type(obj) is FunctionType and obj.__closure__ and "instance" in obj.__code__.co_freevars:
+            cells = dict(zip(obj.__code__.co_freevars, obj.__closure__))
+            owner = cells["self"].cell_contents if "self" in cells else None
+            if isinstance(owner, _descript):
+                return getattr, (cells["instance"].cell_contents, owner.f.__name__)
+        return NotImplemented
+
+def _restore_kiosk(kiosk: VariableKiosk, state: Tuple[Dict, Dict]) -> None:
+    items, attributes = state
+    dict.update(kiosk, items)
+    kiosk.__dict__.update(attributes)
+
+def _shared_ref(key: str) -> Any:
+    raise pickle.UnpicklingError(f"Shared object '{key}' was not supplied to the unpickler.")
+
+class _EngineUnpickler(pickle.Unpickler):
+    def __init__(self, file, shared: Dict[str, Any]) -> None:
+        super().__init__(file)
+        self._shared = shared
+    def find_class(self, module, name):
+        if name == _shared_ref.__name__ and module == __name__:
+            return self._shared.__getitem__
+        return super().find_class(module, name)
+
+def _signal_wiring(kiosk) -> List[Tuple[Any, str, Any]]:
+    """List (owner, method name, signal) for every handler connected to ``kiosk``."""
+    wiring: List[Tuple[Any, str, Any]] = []
+    for signal, receivers in list(_dispatcher.connections.get(id(kiosk), {}).items()):
+        for receiver in _dispatcher.liveReceivers(receivers):
+            owner = getattr(receiver, "__self__", None)
+            if owner is not None:
+                wiring.append((owner, receiver.__name__, signal))
+    return wiring
+
+def _rewire_signals(kiosk, wiring: List[Tuple[Any, str, Any]]) -> None:
+    # The dispatcher keys connections by id(kiosk), so a restored engine starts deaf.
+    for owner, name, signal in wiring:
+        _dispatcher.connect(getattr(owner, name), signal, sender=kiosk)
+
+def _rebind_kiosk(kiosk: VariableKiosk, templates: List[Tuple[StatesRatesCommon, int]]) -> None:
+    """Point kiosk registrations at the restored states/rates objects and re-publish them."""
+    new_ids = {old_id: id(template) for template, old_id in templates}
+    registries = (kiosk.registered_states, kiosk.registered_rates, kiosk.published_states, kiosk.published_rates)
+    for registry in registries:
+        for name, oid in registry.items():
+            registry[name] = new_ids.get(oid, oid)
+    published = {**kiosk.published_states, **kiosk.published_rates}
+    for template, _ in templates:
+        names = [name for name, oid in published.items() if oid == id(template)]
+        if names:
+            template.observe(handler=template._update_kiosk, names=names, type=_ALL_TRAIT_EVENTS)
+
+def _dump_engine(root: Any, kiosk: VariableKiosk, shared: Dict[int, str]) -> bytes:
+    """Pickle ``root`` (an object graph holding a WOFOST engine) together with its wiring."""
+    buffer = io.BytesIO()
+    pickler = _EnginePickler(buffer, shared)
+    pickler.dump((root, kiosk, _signal_wiring(kiosk)))
+    # Second record in the same stream, so the memo maps these back onto the objects above.
+    pickler.dump([(template, oid) for oid, template in pickler.templates.items()])
+    return buffer.getvalue()
+
+def _load_engine(blob: bytes, shared: Dict[str, Any]) -> Any:
+    unpickler = _EngineUnpickler(io.BytesIO(blob), shared)
+    root, kiosk, wiring = unpickler.load()
+    _rebind_kiosk(kiosk, unpickler.load())
+    _rewire_signals(kiosk, wiring)
+    return root
+
+class CropCatalogue:
+    """Process-wide, thread-safe index over the YAML crop library.
+
+    The library is parsed once; crop/variety resolution is memoized and each session gets
+    its own shallow copy of the parameter set instead of a freshly parsed provider.
+    """
+    def __init__(self, model=ModelType) -> None:
+        self.model = model
+        self._lock = threading.RLock()
+        self._provider: Optional[YAMLCropDataProvider] = None
+        self._options: Dict[str, List[str]] = {}
+        self._resolved: Dict[Tuple[str, Optional[str]], Tuple[str, str]] = {}
+        self._parameters: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    def load(self) -> "CropCatalogue":
+        with self._lock:
+            if self._provider is None:
+                provider = YAMLCropDataProvider(model=self.model, force_reload=False)
+                self._options = {crop: list(varieties) for crop, varieties in provider.get_crops_varieties().items()}
+                self._provider = provider
+        return self
+    def options(self) -> Dict[str, List[str]]:
+        self.load()
+        return self._options
+    def resolve(self, user_crop: str, user_variety: Optional[str] = None) -> Tuple[str, str]:
+        cache_key = (user_crop, user_variety or None)
+        resolved = self._resolved.get(cache_key)
+        if resolved is not None:
+            return resolved
+        options = self.options()
+        crop_names = list(options.keys())
+        crop_key = user_crop if user_crop in crop_names else None
+        if crop_key is None:
+            matches = get_close_matches(user_crop, crop_names, n=1, cutoff=0.0)
+            crop_key = matches[0] if matches else None
+        if crop_key is None:
+            raise KeyError(f"Crop '{user_crop}' not found. Available options: {crop_names}")
+        varieties = options[crop_key]
+        if not varieties:
+            raise KeyError(f"No varieties found for crop '{crop_key}'.")
+        if user_variety:
+            var_key = user_variety if user_variety in varieties else None
+            if var_key is None:
+                matches = get_close_matches(user_variety, varieties, n=1, cutoff=0.0)
+                var_key = matches[0] if matches else varieties[0]
+        else:
+            var_key = "generic" if "generic" in varieties else varieties[0]
+        resolved = (crop_key, var_key)
+        with self._lock:
+            self._resolved[cache_key] = resolved
+        return resolved
+    def parameters(self, crop_key: str, var_key: str) -> Dict[str, Any]:
+        """Return a per-session copy of the parameter set; the underlying values are shared."""
+        key = (crop_key, var_key)
+        params = self._parameters.get(key)
+        if params is None:
+            with self._lock:
+                params = self._parameters.get(key)
+                if params is None:
+                    provider = self.load()._provider
+                    provider.set_active_crop(crop_key, var_key)
+                    params = dict(provider)
+                    self._parameters[key] = params
+        return dict(params)
+
+_CATALOGUES: Dict[Any, CropCatalogue] = {}
+_CATALOGUES_LOCK = threading.Lock()
+
+def get_crop_catalogue(model=ModelType) -> CropCatalogue:
+    catalogue = _CATALOGUES.get(model)
+    if catalogue is None:
+        with _CATALOGUES_LOCK:
+            catalogue = _CATALOGUES.setdefault(model, CropCatalogue(model))
+    return catalogue
+
+def get_site_data(lat: float, lon: float, elev: float, start_soil_n: float = 60.0) -> FrozenParameters:
+    """Shared, read-only SNOMIN site parameters for a location, built once per site cache entry."""
+    def build() -> Dict[str, Any]:
+        site = WOFOST81SiteDataProvider_SNOMIN(**get_site_parameters(lat, lon, elev, get_soil_profile(), start_soil_n))
+        site.update({"LAT": lat, "LON": lon, "ELEV": elev})
+        return site
+    return get_site_cache().get((lat, lon, elev, start_soil_n), build)
+
 def resolve_crop_variety(
     user_crop: str,
     user_variety: Optional[str] = None,
     model=ModelType,
 ) -> Tuple[str, str]:
-    cropd = YAMLCropDataProvider(model=model, force_reload=False)
-    options = cropd.get_crops_varieties()
-    crop_names = list(options.keys())
-    crop_key = user_crop if user_crop in crop_names else None
-    if crop_key is None:
-        matches = get_close_matches(user_crop, crop_names, n=1, cutoff=0.0)
-        crop_key = matches[0] if matches else None
-    if crop_key is None:
-        raise KeyError(f"Crop '{user_crop}' not found. Available options: {crop_names}")
-    varieties = list(options[crop_key])
-    if not varieties:
-        raise KeyError(f"No varieties found for crop '{crop_key}'.")
-    if user_variety:
-        var_key = user_variety if user_variety in varieties else None
-        if var_key is None:
-            matches = get_close_matches(user_variety, varieties, n=1, cutoff=0.0)
-            var_key = matches[0] if matches else varieties[0]
-    else:
-        var_key = "generic" if "generic" in varieties else varieties[0]
-    return crop_key, var_key
+    return get_crop_catalogue(model).resolve(user_crop, user_variety)
+
+# Scheduled actions are module-level functions bound with functools.partial so that a
+# game's action queue can be pickled into snapshots and session checkpoints.
+def _irrigate(engine: ModelType, amount_cm: float, efficiency: float) -> None:
+    engine._send_signal(signal=signals.irrigate, amount=amount_cm, efficiency=efficiency)
+
+def _apply_nitrogen(engine: ModelType, n_kg_ha: float, nh4: float, no3: float) -> None:
+    engine._send_signal(
+        signal=signals.apply_n_snomin,
+        amount=n_kg_ha,
+        application_depth=10.0,
+        cnratio=8.0,
+        initial_age=0.1,
+        f_NH4N=nh4,
+        f_NO3N=no3,
+        f_orgmat=0.0,
+    )
+
+def _finish_crop(engine: ModelType, reason: str, delete: bool) -> None:
+    engine._send_signal(signal=signals.crop_finish, day=engine.day, finish_type=reason, crop_delete=delete)
+
+class StateExtractor:
+    """Reads a fixed list of WOFOST variables (plus derived fields) from an engine.
+
+    Each name is resolved once to the states/rates object that registered it with the
+    kiosk, so a read is a plain attribute lookup instead of ``get_variable``'s hierarchy
+    walk. The binding is redone only when the kiosk registry changes (sowing, harvest,
+    or a restored engine). ``soil_n`` reports the first SOIL_N_VARIABLES name whose value
+    is set, checked on every read since the preferred pools may fill in later.
+    """
+    def __init__(self, variables: Optional[Iterable[str]] = None) -> None:
+        self.variables: Tuple[str, ...] = tuple(variables) if variables else DEFAULT_STATE_VARIABLES
+        self._key: Optional[Tuple[int, ...]] = None
+        self._readers: List[Tuple[str, Any, str]] = []
+        self._soil_n: List[Tuple[Any, str]] = []
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"variables": self.variables, "_key": None, "_readers": [], "_soil_n": []}
+    def _bind(self, engine: ModelType) -> None:
+        kiosk = engine.kiosk
+        owners: Dict[int, Any] = {}
+        pending = [obj for obj in (engine.crop, engine.soil) if obj is not None]
+        while pending:
+            simobj = pending.pop()
+            for template in (simobj.states, simobj.rates):
+                if template is not None:
+                    owners[id(template)] = template
+            pending.extend(simobj.subSimObjects)
+        def locate(name: str) -> Optional[Tuple[Any, str]]:
+            for candidate in (name, name.upper()):
+                oid = kiosk.registered_states.get(candidate) or kiosk.registered_rates.get(candidate)
+                if oid in owners:
+                    return owners[oid], candidate
+            return None
+        self._readers = []
+        for name in self.variables:
+            found = None if name == "soil_n" else locate(name)
+            if found is not None:
+                self._readers.append((name, found[0], found[1]))
+        self._soil_n = []
+        if "soil_n" in self.variables:
+            for name in SOIL_N_VARIABLES:
+                found = locate(name)
+                if found is not None:
+                    self._soil_n.append(found)
+        self._key = self._registry_key(engine)
+    @staticmethod
+    def _registry_key(engine: ModelType) -> Tuple[int, ...]:
+        kiosk = engine.kiosk
+        return id(kiosk), id(engine.crop), len(kiosk.registered_states), len(kiosk.registered_rates)
+    def __call__(self, engine: ModelType) -> Dict[str, Any]:
+        if self._key != self._registry_key(engine):
+            self._bind(engine)
+        state: Dict[str, Any] = {}
+        for name, owner, attribute in self._readers:
+            value = getattr(owner, attribute)
+            if value is None:
+                continue
+            coerced = _coerce_state_value(value)
+            state[name] = coerced
+            if name == "SM":
+                profile = _numeric_sequence(coerced)
+                if profile:
+                    state["SM"] = float(sum(profile) / len(profile))
+                    state["SM_profile"] = profile
+        for owner, attribute in self._soil_n:
+            raw = getattr(owner, attribute)
+            if raw is not None:
+                numeric = _coerce_to_float(_coerce_state_value(raw))
+                if numeric is not None:
+                    state["soil_n"] = numeric
+                break
+        if "TAGP" in state:
+            try:
+                state["biomass"] = float(state["TAGP"])
+            except (TypeError, ValueError):
+                pass
+        yield_value = _coerce_to_float(state.get("TWSO") or state.get("TAGP") or state.get("biomass"))
+        if yield_value is not None:
+            state["yield_rate"] = yield_value
+        return state
+
+class ActionScheduler:
+    """Min-heap of management actions keyed by (day, sequence).
+
+    Actions due on the same day run in the order they were scheduled. Cancelled entries
+    are dropped lazily when they reach the top, and the heap is rebuilt once they outnumber
+    the live actions. A recurring action keeps a single heap entry that is re-pushed after
+    each run, so a tick only touches the actions due that day.
+    """
+    def __init__(self) -> None:
+        self._heap: List[Tuple[date, int, int]] = []
+        self._actions: Dict[int, Dict[str, Any]] = {}
+        # Action ids handed to clients, and the heap tie-break (also bumped when re-arming).
+        self._next_id = 0
+        self._sequence = 0
+    def __len__(self) -> int:
+        return len(self._actions)
+    def schedule(self, day: date, callback: Callable[[ModelType], None], every_days: Optional[int] = None, until: Optional[date] = None) -> int:
+        if every_days is not None and every_days < 1:
+            raise ValueError("every_days must be at least 1.")
+        self._next_id += 1
+        self._sequence += 1
+        action_id = self._next_id
+        self._actions[action_id] = {"day": day, "callback": callback, "every_days": every_days, "until": until}
+        heapq.heappush(self._heap, (day, self._sequence, action_id))
+        return action_id
+    def cancel(self, action_id: int) -> bool:
+        if self._actions.pop(action_id, None) is None:
+            return False
+        if len(self._heap) > 2 * len(self._actions):
+            self._compact()
+        return True
+    def _compact(self) -> None:
+        actions = self._actions
+        self._heap = [entry for entry in self._heap if entry[2] in actions and actions[entry[2]]["day"] == entry[0]]
+        heapq.heapify(self._heap)
+    def clear(self) -> None:
+        self._heap.clear()
+        self._actions.clear()
+    def pop_due(self, day: date) -> List[Callable[[ModelType], None]]:
+        """Remove and return the callbacks due on or before ``day``; recurring ones are re-armed."""
+        heap = self._heap
+        ready: List[Callable[[ModelType], None]] = []
+        while heap and heap[0][0] <= day:
+            due, _, action_id = heapq.heappop(heap)
+            action = self._actions.get(action_id)
+            if action is None or action["day"] != due:
+                continue
+            ready.append(action["callback"])
+            every = action["every_days"]
+            if every is None:
+                del self._actions[action_id]
+                continue
+            following = due + timedelta(days=every)
+            while following <= day:
+                following += timedelta(days=every)
+            if action["until"] is not None and following > action["until"]:
+                del self._actions[action_id]
+                continue
+            action["day"] = following
+            self._sequence += 1
+            heapq.heappush(heap, (following, self._sequence, action_id))
+        return ready
+    def pending(self) -> List[Dict[str, Any]]:
+        """Scheduled actions in the order they will run, as plain dicts."""
+        listing = []
+        for action_id, action in sorted(self._actions.items(), key=lambda item: item[1]["day"]):
+            callback = action["callback"]
+            name = getattr(callback, "func", callback).__name__.lstrip("_")
+            listing.append({
+                "action_id": action_id,
+                "action": name,
+                "day": action["day"],
+                "every_days": action["every_days"],
+                "until": action["until"],
+                "args": dict(getattr(callback, "keywords", {}) or {}),
+            })
+        return listing
+    def copy(self) -> "ActionScheduler":
+        clone = ActionScheduler()
+        clone._heap = list(self._heap)
+        clone._actions = {action_id: dict(action) for action_id, action in self._actions.items()}
+        clone._next_id = self._next_id
+        clone._sequence = self._sequence
+        return clone
+
+class ManagementPolicy:
+    """Server-side water/fertilize rule checked every simulated day.
+
+    A threshold rule fires while ``variable`` (SM, soil_n, DVS or any readable state) is
+    below/above its bounds; a calendar rule fires on ``start`` and then every ``every_days``.
+    Both can be combined and limited to a ``start``..``until`` window, a cooldown between
+    applications and a maximum number of applications.
+    """
+    def __init__(self, action: str, amount: float, variable: Optional[str] = None, below: Optional[float] = None,
+                 above: Optional[float] = None, start: Optional[date] = None, until: Optional[date] = None,
+                 every_days: Optional[int] = None, cooldown_days: int = 0, max_applications: Optional[int] = None,
+                 efficiency: float = 0.75, nh4_fraction: float = 0.7, name: Optional[str] = None) -> None:
+        if action not in POLICY_ACTIONS:
+            raise ValueError(f"Policy action must be one of: {', '.join(POLICY_ACTIONS)}")
+        if variable is not None and below is None and above is None:
+            raise ValueError(f"Policy on '{variable}' needs a 'below' or 'above' threshold.")
+        if every_days is not None and every_days < 1:
+            raise ValueError("every_days must be at least 1.")
+        self.action = action
+        self.amount = amount
+        self.variable = variable
+        self.below = below
+        self.above = above
+        self.start = start
+        self.until = until
+        self.every_days = every_days
+        self.cooldown_days = max(0, cooldown_days)
+        self.max_applications = max_applications
+        self.efficiency = max(0.0, min(1.0, efficiency))
+        self.nh4_fraction = max(0.0, min(1.0, nh4_fraction))
+        self.name = name or (f"{action} when {variable}" if variable else f"{action} on schedule")
+        self.applications = 0
+        self.last_day: Optional[date] = None
+        self._anchor: Optional[date] = start
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "ManagementPolicy":
+        if not isinstance(spec, dict):
+            raise ValueError("Each policy must be an object.")
+        action = str(spec.get("action") or spec.get("do") or "").lower()
+        if action == "fertilise":
+            action = "fertilize"
+        amount = spec.get("amount", spec.get("amount_cm" if action == "water" else "amount_kg_ha"))
+        if amount is None:
+            raise ValueError(f"Policy '{action}' requires an amount.")
+        variable = spec.get("variable")
+        if variable is not None and not _VARIABLE_NAME_RE.match(str(variable)):
+            raise ValueError(f"Invalid variable name: {variable!r}")
+        def number(key: str, default: Optional[float] = None) -> Optional[float]:
+            return default if spec.get(key) is None else float(spec[key])
+        def whole(key: str) -> Optional[int]:
+            return None if spec.get(key) is None else int(spec[key])
+        def day(key: str) -> Optional[date]:
+            return _parse_date(spec[key]) if spec.get(key) else None
+        try:
+            return cls(
+                action, float(amount), variable=str(variable) if variable is not None else None,
+                below=number("below"), above=number("above"), start=day("start"), until=day("until"),
+                every_days=whole("every_days"), cooldown_days=whole("cooldown_days") or 0,
+                max_applications=whole("max_applications"), efficiency=number("efficiency", 0.75),
+                nh4_fraction=number("nh4_fraction", 0.7), name=spec.get("name"),
+            )
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid policy: {exc}")
+    def due(self, day: date, state: Dict[str, Any]) -> bool:
+        if self.max_applications is not None and self.applications >= self.max_applications:
+            return False
+        if (self.start is not None and day < self.start) or (self.until is not None and day > self.until):
+            return False
+        if self.last_day is not None and (day - self.last_day).days < max(1, self.cooldown_days):
+            return False
+        if self.every_days is not None:
+            if self._anchor is None:
+                self._anchor = day
+            if (day - self._anchor).days % self.every_days:
+                return False
+        if self.variable is None:
+            return self.every_days is not None or self.applications == 0
+        value = _coerce_to_float(state.get(self.variable))
+        if value is None:
+            return False
+        return (self.below is None or value < self.below) and (self.above is None or value > self.above)
+    def callback(self) -> Callable[[ModelType], None]:
+        if self.action == "water":
+            return functools.partial(_irrigate, amount_cm=self.amount, efficiency=self.efficiency)
+        return functools.partial(_apply_nitrogen, n_kg_ha=self.amount, nh4=self.nh4_fraction, no3=1.0 - self.nh4_fraction)
+    def describe(self) -> Dict[str, Any]:
+        fields = ("name", "action", "amount", "variable", "below", "above", "start", "until", "every_days",
+                  "cooldown_days", "max_applications", "applications", "last_day")
+        return {key: getattr(self, key) for key in fields}
 
 class CropGame:
     """Lightweight wrapper around WOFOST to support turn-based gameplay."""
-    def __init__(self, lat: float, lon: float, elev: float) -> None:
+    def __init__(self, lat: float, lon: float, elev: float, variables: Optional[Iterable[str]] = None) -> None:
         self.lat = lat
         self.lon = lon
         self.elev = elev
+        self.extractor = StateExtractor(variables)
+        self.recorder: Optional[SeriesRecorder] = None
+        self.weather_format = "string"
         self.params: Optional[ParameterProvider] = None
         self.weather: Optional[GameWeatherProvider] = None
         self.model: Optional[ModelType] = None
         self.current_day: Optional[date] = None
         self._last_day: Optional[date] = None
-        self._action_queue: List[Tuple[date, Callable[[ModelType], None]]] = []
-    def plant(self, crop_name: str, sowing_date: date, variety_name: Optional[str] = None) -> None:
-        cropd = YAMLCropDataProvider(model=ModelType, force_reload=False)
-        crop_key, var_key = resolve_crop_variety(crop_name, variety_name, model=ModelType)
-        cropd.set_active_crop(crop_key, var_key)
-        soil = get_soil_profile()
-        site_kwargs = get_site_parameters(self.lat, self.lon, self.elev, soil)
-        site = WOFOST81SiteDataProvider_SNOMIN(**site_kwargs)
-        site.update({"LAT": self.lat, "LON": self.lon, "ELEV": self.elev})
+        self.actions = ActionScheduler()
+        self.policies: List[ManagementPolicy] = []
+        self._policy_state: Optional[StateExtractor] = None
+    def plant(self, crop_name: str, sowing_date: date, variety_name: Optional[str] = None,
+              prefetch: bool = True, max_days: Optional[int] = None) -> None:
+        """Start a season; bounded runs pass ``max_days`` (and ``prefetch=False``) to skip look-ahead fetches."""
+        catalogue = get_crop_catalogue(ModelType)
+        crop_key, var_key = catalogue.resolve(crop_name, variety_name)
+        cropd = catalogue.parameters(crop_key, var_key)
+        # Soil and site are frozen and shared across sessions; writes (pcse stores the built
+        # soil_profile back into the parameters) land in each session's ChainMap overlay.
+        soil = ChainMap({}, get_soil_profile())
+        site = ChainMap({}, get_site_data(self.lat, self.lon, self.elev))
         self.params = ParameterProvider(cropd, soil, site)
         seed_day = sowing_date - timedelta(days=1)
-        seed_record = get_weather(self.lat, self.lon, seed_day)
-        self.weather = GameWeatherProvider(self.lat, self.lon, self.elev, seed_record)
+        season_end = sowing_date + timedelta(days=SIM_DAYS + WEATHER_MARGIN_DAYS)
+        season = get_weather_range(self.lat, self.lon, seed_day, season_end)
+        self.weather = GameWeatherProvider(self.lat, self.lon, self.elev, season[0])
+        for record in season[1:]:
+            self.weather.add_record(record)
+        self.weather.prefetch = prefetch
+        if max_days is not None:
+            self.weather.season_end = sowing_date + timedelta(days=max_days)
         agroman = {
             "AgroManagement": [
                 {
@@ -128,129 +676,360 @@ class CropGame:
         self.model = ModelType(self.params, self.weather, agroman)
         self.current_day = sowing_date
         self._last_day = None
-        self._action_queue.clear()
-    def _schedule_action(self, day: date, callback: Callable[[ModelType], None]) -> None:
+        self.actions.clear()
+    def _schedule_action(self, day: date, callback: Callable[[ModelType], None], every_days: Optional[int] = None, until: Optional[date] = None) -> int:
         if self.model is None or self.current_day is None:
             raise RuntimeError("Plant a crop before scheduling actions.")
         if day < self.current_day:
             raise ValueError("Cannot schedule an action in the past.")
-        self._action_queue.append((day, callback))
-        self._action_queue.sort(key=lambda item: item[0])
-    def water(self, amount_cm: float, when: Optional[date] = None, efficiency: float = 0.75) -> None:
+        return self.actions.schedule(day, callback, every_days=every_days, until=until)
+    def water(self, amount_cm: float, when: Optional[date] = None, efficiency: float = 0.75, every_days: Optional[int] = None, until: Optional[date] = None) -> int:
         if self.model is None or self.current_day is None:
             raise RuntimeError("Plant first.")
         target_day = when or self.current_day
-        def _do(engine: ModelType) -> None:
-            engine._send_signal(signal=signals.irrigate, amount=amount_cm, efficiency=efficiency)
-        self._schedule_action(target_day, _do)
-    def fertilize(self, n_kg_ha: float, when: Optional[date] = None, nh4_fraction: float = 0.7) -> None:
+        return self._schedule_action(target_day, functools.partial(_irrigate, amount_cm=amount_cm, efficiency=efficiency), every_days, until)
+    def fertilize(self, n_kg_ha: float, when: Optional[date] = None, nh4_fraction: float = 0.7, every_days: Optional[int] = None, until: Optional[date] = None) -> int:
         if self.model is None or self.current_day is None:
             raise RuntimeError("Plant first.")
         target_day = when or self.current_day
         nh4 = max(0.0, min(1.0, nh4_fraction))
         no3 = max(0.0, 1.0 - nh4)
-        def _do(engine: ModelType) -> None:
-            engine._send_signal(
-                signal=signals.apply_n_snomin,
-                amount=n_kg_ha,
-                application_depth=10.0,
-                cnratio=8.0,
-                initial_age=0.1,
-                f_NH4N=nh4,
-                f_NO3N=no3,
-                f_orgmat=0.0,
-            )
-        self._schedule_action(target_day, _do)
-    def kill(self, when: Optional[date] = None, reason: str = "killed", delete: bool = True) -> None:
+        return self._schedule_action(target_day, functools.partial(_apply_nitrogen, n_kg_ha=n_kg_ha, nh4=nh4, no3=no3), every_days, until)
+    def kill(self, when: Optional[date] = None, reason: str = "killed", delete: bool = True) -> int:
         if self.model is None or self.current_day is None:
             raise RuntimeError("Plant first.")
         target_day = when or self.current_day
-        def _do(engine: ModelType) -> None:
-            engine._send_signal(signal=signals.crop_finish, day=engine.day, finish_type=reason, crop_delete=delete)
-        self._schedule_action(target_day, _do)
+        return self._schedule_action(target_day, functools.partial(_finish_crop, reason=reason, delete=delete))
+    def cancel_action(self, action_id: int) -> bool:
+        return self.actions.cancel(action_id)
+    def set_policies(self, policies: Iterable[ManagementPolicy]) -> None:
+        self.policies = list(policies)
+        variables = [policy.variable for policy in self.policies if policy.variable]
+        self._policy_state = StateExtractor(dict.fromkeys(variables)) if variables else None
+    def _apply_policies(self, day: date) -> None:
+        engine = self.model
+        state = self._policy_state(engine) if self._policy_state is not None else {}
+        for policy in self.policies:
+            if policy.due(day, state):
+                policy.applications += 1
+                policy.last_day = day
+                policy.callback()(engine)
     def _apply_pending_actions(self, day: date) -> None:
-        if self.model is None:
+        if self.model is None or not self.actions:
             return
-        ready: List[Callable[[ModelType], None]] = []
-        future: List[Tuple[date, Callable[[ModelType], None]]] = []
-        for action_day, callback in self._action_queue:
-            if action_day <= day:
-                ready.append(callback)
-            else:
-                future.append((action_day, callback))
-        self._action_queue = future
-        for callback in ready:
+        for callback in self.actions.pop_due(day):
             callback(self.model)
-    def tick(self) -> Tuple[date, Dict[str, float]]:
+    def tick(self, extract: bool = True) -> Tuple[date, Optional[Dict[str, Any]]]:
+        """Advance one day; the state is read only if ``extract`` (callers batching steps skip it)."""
         if self.model is None:
             raise RuntimeError("Plant first.")
         engine = self.model
+        perf = time.perf_counter
+        started = perf()
         day, delta = engine.timer()
         engine.integrate(day, delta)
+        integrated = perf()
         drv = engine._get_driving_variables(day)
         engine.drv = drv
+        weathered = perf()
         engine.agromanager(day, drv)
+        if self.policies:
+            self._apply_policies(day)
         self._apply_pending_actions(day)
+        managed = perf()
         engine.calc_rates(day, drv)
         if engine.flag_terminate:
             engine._terminate_simulation(day)
+        rated = perf()
         self._last_day = day
         self.current_day = day + timedelta(days=1)
-        return day, self.get_state()
+        recorder = self.recorder
+        state = self.get_state() if extract or recorder is not None else None
+        if recorder is not None:
+            recorder.record(day, state)
+        extracted = perf()
+        METRICS.observe("tick_phase_seconds", integrated - started, phase="integrate")
+        METRICS.observe("tick_phase_seconds", weathered - integrated, phase="weather")
+        METRICS.observe("tick_phase_seconds", managed - weathered, phase="management")
+        METRICS.observe("tick_phase_seconds", rated - managed, phase="calc_rates")
+        if state is not None:
+            METRICS.observe("tick_phase_seconds", extracted - rated, phase="get_state")
+        METRICS.observe("tick_seconds", extracted - started)
+        return day, state if extract else None
+    def advance(self, steps: int) -> Tuple[Optional[date], int]:
+        """Fast-forward up to ``steps`` days without reading state, stopping when the season ends.
+
+        Returns the last simulated day (None if no day ran) and the number of days simulated;
+        callers read the state once afterwards with ``get_state``.
+        """
+        tick = self.tick
+        last_day = None
+        executed = 0
+        for _ in range(max(0, int(steps))):
+            last_day, _ = tick(extract=False)
+            executed += 1
+            if self.model.flag_terminate:
+                break
+        return last_day, executed
+    @property
+    def finished(self) -> bool:
+        return bool(self.model is not None and self.model.flag_terminate)
+    def record(self, variables: Optional[Iterable[str]] = None) -> SeriesRecorder:
+        """Attach a recorder that keeps every simulated day from now on (one column per variable)."""
+        self.recorder = SeriesRecorder(scalar_variables(variables or self.extractor.variables))
+        return self.recorder
+    def snapshot(self) -> "GameSnapshot":
+        return GameSnapshot(self)
+    def fork(self) -> "CropGame":
+        return GameSnapshot(self).fork()
     def get_state(self) -> Dict[str, Any]:
         if self.model is None:
             return {}
-        variables = ["DVS", "LAI", "SM", "TAGP", "TWSO", "TRA", "EVS"]
-        state: Dict[str, Any] = {}
-        for name in variables:
-            try:
-                value = self.model.get_variable(name)
-            except Exception:
-                value = None
-            if value is not None:
-                coerced = _coerce_state_value(value)
-                state[name] = coerced
-                if name == "SM":
-                    profile = _numeric_sequence(coerced)
-                    if profile:
-                        average = sum(profile) / len(profile)
-                        state["SM"] = float(average)
-                        state["SM_profile"] = profile
-        soil_n_value = None
-        if self.model is not None:
-            for var_name in SOIL_N_VARIABLES:
+        return self.extractor(self.model)
+
+class GameSnapshot:
+    """Frozen copy of a CropGame mid-season that can be forked into independent games.
+
+    The engine is kept as a pickle blob; the weather store is shared copy-on-write with the
+    source game and with every fork, and the frozen soil and site parameters by reference.
+    """
+    def __init__(self, game: CropGame) -> None:
+        if game.model is None or game.weather is None:
+            raise RuntimeError("Plant first.")
+        self.lat = game.lat
+        self.lon = game.lon
+        self.elev = game.elev
+        self.variables = game.extractor.variables
+        self.weather_format = game.weather_format
+        self.current_day = game.current_day
+        self.last_day = game._last_day
+        self.actions = game.actions.copy()
+        self.policies = [copy.copy(policy) for policy in game.policies]
+        self.recorder = game.recorder.copy() if game.recorder is not None else None
+        self.weather = game.weather.fork()
+        self.parameters = {"soil": get_soil_profile(), "site": get_site_data(self.lat, self.lon, self.elev)}
+        shared = {id(value): name for name, value in self.parameters.items()}
+        shared[id(game.weather)] = "weather"
+        self.engine_blob = _dump_engine((game.model, game.params), game.model.kiosk, shared)
+    def fork(self) -> CropGame:
+        game = CropGame(self.lat, self.lon, self.elev, self.variables)
+        game.weather_format = self.weather_format
+        game.weather = self.weather.fork()
+        game.model, game.params = _load_engine(self.engine_blob, dict(self.parameters, weather=game.weather))
+        game.current_day = self.current_day
+        game._last_day = self.last_day
+        game.actions = self.actions.copy()
+        game.set_policies(copy.copy(policy) for policy in self.policies)
+        game.recorder = self.recorder.copy() if self.recorder is not None else None
+        return game
+
+class SessionStore:
+    """Directory of compressed session checkpoints, one file per session id.
+
+    A checkpoint is the pickled CropGame (engine, weather, action scheduler and policies) plus the
+    session bookkeeping needed to answer the next request, so ``load`` resumes a farm
+    without replaying its ticks. Files are replaced atomically, and every save prunes
+    checkpoints older than ``max_age`` seconds or beyond the newest ``max_count``.
+
+    The header after MAGIC holds the SHA-256 of the session's resume token (zeros when it
+    has none). ``load`` checks it before unpickling anything.
+    """
+    MAGIC = b"SFSESS4\n"
+    DIGEST_BYTES = 32
+    def __init__(self, directory: str, max_age: Optional[float] = None, max_count: Optional[int] = None) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_age = SESSION_MAX_AGE if max_age is None else max_age
+        self.max_count = max(1, int(SESSION_MAX_COUNT if max_count is None else max_count))
+        os.makedirs(self.directory, exist_ok=True)
+    def path(self, session_id: str) -> str:
+        return os.path.join(self.directory, _check_session_id(session_id) + ".ckpt")
+    def exists(self, session_id: str) -> bool:
+        return os.path.exists(self.path(session_id))
+    def save(self, session: Dict[str, Any]) -> int:
+        game: CropGame = session["game"]
+        meta = {key: session.get(key) for key in _PERSISTED_SESSION_KEYS}
+        blob = _dump_engine((game, meta), game.model.kiosk, {})
+        digest = session.get("resume_digest") or bytes(self.DIGEST_BYTES)
+        body = self.MAGIC + digest + zlib.compress(blob, CHECKPOINT_COMPRESSION)
+        target = self.path(meta["session_id"])
+        temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(body)
+        os.replace(temporary, target)
+        self.prune(keep=target)
+        return len(body)
+    def prune(self, keep: Optional[str] = None) -> int:
+        """Remove expired checkpoints and the oldest ones over ``max_count``; returns how many."""
+        now = time.time()
+        entries: List[Tuple[float, str]] = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".ckpt") or entry.path == keep:
+                    continue
                 try:
-                    raw = self.model.get_variable(var_name)
-                except Exception:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
                     continue
-                if raw is not None:
-                    soil_n_value = _coerce_state_value(raw)
-                    break
-        if soil_n_value is not None:
-            numeric = _coerce_to_float(soil_n_value)
-            if numeric is not None:
-                state["soil_n"] = numeric
-        if "TAGP" in state:
+        entries.sort(reverse=True)
+        limit = self.max_count - (1 if keep else 0)
+        removed = 0
+        for index, (mtime, path) in enumerate(entries):
+            if index < limit and (not self.max_age or now - mtime <= self.max_age):
+                continue
             try:
-                state["biomass"] = float(state["TAGP"])
-            except (TypeError, ValueError):
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
                 pass
-        yield_candidate = state.get("TWSO") or state.get("TAGP") or state.get("biomass")
-        yield_value = _coerce_to_float(yield_candidate)
-        if yield_value is not None:
-            state["yield_rate"] = yield_value
-        return state
+        return removed
+    def load(self, session_id: str, resume_token: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(session_id), "rb") as handle:
+                body = handle.read()
+        except FileNotFoundError:
+            return None
+        if not body.startswith(self.MAGIC):
+            raise ValueError(f"Checkpoint for session '{session_id}' is not in a supported format.")
+        start = len(self.MAGIC)
+        digest = body[start:start + self.DIGEST_BYTES]
+        if not any(digest) or not hmac.compare_digest(digest, _token_digest(resume_token)):
+            raise PermissionError(f"Invalid resume token for session '{session_id}'.")
+        game, meta = _load_engine(zlib.decompress(body[start + self.DIGEST_BYTES:]), {})
+        return dict(meta, game=game, resume_digest=digest)
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self.path(session_id))
+        except FileNotFoundError:
+            pass
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_PERSISTED_SESSION_KEYS = ("session_id", "ticks", "payload", "sowing_date", "crop")
+_session_store: Optional[SessionStore] = None
+# Session ids held by live connections, so a second client cannot adopt (and overwrite) them.
+_live_sessions: Dict[str, Dict[str, Any]] = {}
+_live_sessions_lock = threading.Lock()
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+def _check_session_id(value: Any) -> str:
+    session_id = str(value or "")
+    if not _SESSION_ID_RE.match(session_id):
+        raise ValueError("session_id must be 1-64 characters of letters, digits, '-' or '_'.")
+    return session_id
+
+def set_session_store(store: Optional[SessionStore]) -> None:
+    """Enable (or with ``None`` disable) session checkpoints for this process."""
+    global _session_store
+    _session_store = store
+
+def _checkpoint_session(session: Dict[str, Any], force: bool = False) -> None:
+    """Write the session's checkpoint if it changed and is due (or ``force`` is set).
+
+    A finished season has nothing left to resume, so its checkpoint is removed instead.
+    """
+    store = _session_store
+    if store is None or session.get("game") is None:
+        return
+    if session["game"].finished:
+        _discard_checkpoint(session)
+        return
+    if not session.get("checkpoint_dirty"):
+        return
+    ticks = session.get("ticks", 0)
+    if not force and ticks - session.get("checkpoint_tick", 0) < CHECKPOINT_EVERY:
+        return
+    try:
+        with METRICS.timer("checkpoint_seconds"):
+            size = store.save(session)
+    except Exception:
+        logger.exception("checkpoint failed session=%s", session.get("session_id"))
+        return
+    METRICS.incr("checkpoint_bytes", size)
+    session["checkpoint_tick"] = ticks
+    session["checkpoint_dirty"] = False
+
+def _discard_checkpoint(session: Dict[str, Any], session_id: Optional[str] = None) -> None:
+    store = _session_store
+    session_id = session_id or session.get("session_id")
+    if store is None or not session_id:
+        return
+    try:
+        store.delete(session_id)
+    except Exception:
+        logger.exception("checkpoint delete failed session=%s", session_id)
+
+def _check_session_available(session: Dict[str, Any], session_id: str, resuming: bool = False) -> None:
+    """Refuse ids held by another connection, and (unless resuming) ids that already have a checkpoint."""
+    with _live_sessions_lock:
+        owner = _live_sessions.get(session_id)
+    if owner is not None and owner is not session:
+        raise ValueError(f"Session '{session_id}' is in use by another connection.")
+    if not resuming and owner is None and session_id != session.get("session_id") \
+            and _session_store is not None and _session_store.exists(session_id):
+        raise ValueError(f"Session '{session_id}' already exists; resume it instead.")
+
+def _adopt_session_id(session: Dict[str, Any], session_id: str) -> None:
+    """Claim ``session_id`` for this connection and let go of the one it held before."""
+    previous = session.get("session_id")
+    with _live_sessions_lock:
+        owner = _live_sessions.get(session_id)
+        if owner is not None and owner is not session:
+            raise ValueError(f"Session '{session_id}' is in use by another connection.")
+        _live_sessions[session_id] = session
+        if previous and previous != session_id and _live_sessions.get(previous) is session:
+            del _live_sessions[previous]
+    if previous and previous != session_id and not session.get("resumable"):
+        _discard_checkpoint(session, previous)
+
+def _close_session(session: Dict[str, Any]) -> None:
+    """On disconnect keep a checkpoint only for sessions the client can resume by its own id."""
+    try:
+        if session.get("resumable"):
+            _checkpoint_session(session, force=True)
+        else:
+            _discard_checkpoint(session)
+    finally:
+        session_id = session.get("session_id")
+        with _live_sessions_lock:
+            if session_id and _live_sessions.get(session_id) is session:
+                del _live_sessions[session_id]
 
 HOST = "127.0.0.1"
 PORT = 5005
 BUFFER_SIZE = 8192
+MAX_LINE_BYTES = 1 << 20
+
+PROTOCOL_JSON_LINES = "json-lines"
+PROTOCOL_MSGPACK = "msgpack"
 SIM_DAYS = 120
+WEATHER_MARGIN_DAYS = 7
+WEATHER_CHUNK_DAYS = 30
+# Start fetching the next weather chunk in the background this many days before the loaded season ends.
+PREFETCH_AHEAD_DAYS = 14
 DEFAULT_LAT = 49.104
 DEFAULT_LON = -122.66
 DEFAULT_ELEV = 36.0
 
 GAME_BASE_YEAR = 2024
 
+LOG_LEVEL = os.environ.get("SMARTFARMING_LOG_LEVEL", "INFO")
+LOG_BODY_SAMPLE_RATE = float(os.environ.get("SMARTFARMING_LOG_SAMPLE", "0.01"))
+LOG_BODY_MAX_CHARS = 2000
+
+BATCH_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+ASYNC_TICK_WORKERS = max(4, os.cpu_count() or 4)
+MAX_BATCH_SCENARIOS = 5000
+MAX_SNAPSHOTS = 16
+
+# Checkpoints are opt-in: set a directory (or pass --session-dir) to enable them.
+SESSION_DIR = os.environ.get("SMARTFARMING_SESSION_DIR", "")
+SESSION_MAX_AGE = float(os.environ.get("SMARTFARMING_SESSION_MAX_AGE", str(7 * 24 * 3600)))
+SESSION_MAX_COUNT = int(os.environ.get("SMARTFARMING_SESSION_MAX_COUNT", "1000"))
+CHECKPOINT_EVERY = int(os.environ.get("SMARTFARMING_CHECKPOINT_EVERY", "20"))
+CHECKPOINT_COMPRESSION = 1
+RESUME_TOKEN_BYTES = 24
+
 FERTILIZER_PRESETS = {
     "none": 0.0,
     "low": 20.0,
@@ -266,6 +1045,12 @@ IRRIGATION_PRESETS = {
 }
 
 
+DEFAULT_STATE_VARIABLES = ("DVS", "LAI", "SM", "TAGP", "TWSO", "TRA", "EVS", "soil_n")
+MAX_STATE_VARIABLES = 64
+
+POLICY_ACTIONS = ("water", "fertilize")
+MAX_POLICIES = 32
+
 SOIL_N_VARIABLES = [
     "NMIN",
     "NSOIL",
@@ -347,6 +1132,20 @@ def _json_default(value: Any):
         return str(value)
 
 
+_encoder: JsonEncoder = make_encoder(default=_json_default)
+
+
+def set_json_encoder(name: Optional[str] = None) -> JsonEncoder:
+    """Choose the JSON encoder for responses ("auto", "orjson", "msgspec" or "json")."""
+    global _encoder
+    _encoder = make_encoder(name, default=_json_default)
+    return _encoder
+
+
+def _encode_frame(response: Any) -> bytes:
+    return _encoder.dumps(response) + b"\n"
+
+
 def _coerce_to_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -412,7 +1211,12 @@ def _resolve_amount(value: Any, presets: Dict[str, float], label: str) -> float:
             return presets[key]
     raise ValueError(f"Unknown {label} option: {value}")
 
-def _parse_payload(raw: str) -> Dict[str, Any]:
+def _parse_payload(raw: Any) -> Dict[str, Any]:
+    if not isinstance(raw, str):
+        # Binary protocols deliver an already-decoded request.
+        if not isinstance(raw, dict):
+            raise ValueError("Payload must be a map")
+        return raw
     content = raw.strip()
     if not content:
         raise ValueError("Empty payload")
@@ -465,32 +1269,24 @@ def _summarize_weather(record: Any) -> Optional[str]:
 
 
 def _build_weather_payload(game: CropGame, day: date, state: Dict[str, Any]) -> Dict[str, Any]:
+    with METRICS.timer("weather_payload_seconds"):
+        return _weather_payload(game, day, state)
+
+def _weather_payload(game: CropGame, day: date, state: Dict[str, Any]) -> Dict[str, Any]:
     current_weather = None
+    forecast = None
     if game.weather is not None:
         try:
-            record = get_weather(game.lat, game.lon, day)
-            current_weather = record
+            current_weather, forecast = game.weather.record_for(day)
         except Exception:
             current_weather = None
-    if current_weather is None and game.weather is not None:
-        try:
-            key = (game.weather.check_keydate(day), 0)
-            container = game.weather.store.get(key)
-            if container is not None:
-                current_weather = container.__dict__
-        except Exception:
-            current_weather = None
-
-    forecast = None
-    if current_weather is not None:
-        try:
-            forecast = predict_weather(current_weather)
-        except Exception:
             forecast = None
 
     summary = _summarize_weather(current_weather)
+    if game.weather_format == "object":
+        return {"current_summary": summary, "current": current_weather, "forecast": forecast or []}
     try:
-        current_json = json.dumps(current_weather, default=_json_default) if current_weather is not None else None
+        current_json = _encoder.dumps(current_weather).decode("utf-8") if current_weather is not None else None
     except Exception:
         current_json = None
 
@@ -521,62 +1317,23 @@ def simulate_game(payload: Dict[str, Any]) -> Dict[str, Any]:
     lon = float(payload.get("lon", DEFAULT_LON))
     elev = float(payload.get("elev", DEFAULT_ELEV))
 
-    game = CropGame(lat=lat, lon=lon, elev=elev)
-    game.plant(crop_name=crop_name, sowing_date=sowing_date)
+    game = CropGame(lat=lat, lon=lon, elev=elev, variables=_parse_variables(payload.get("variables")))
+    game.plant(crop_name=crop_name, sowing_date=sowing_date, prefetch=False, max_days=SIM_DAYS)
 
+    record = _parse_record(payload.get("record"))
+    if record:
+        game.record()
+    game.set_policies(_parse_policies(payload.get("policies")))
     if irrigation_amount > 0.0:
         game.water(irrigation_amount, efficiency=irrigation_eff)
     if fertilizer_amount > 0.0:
         game.fertilize(fertilizer_amount)
 
-    final_day = sowing_date
-    final_state: Dict[str, float] = {}
-    days_simulated = 0
+    last_day, days_simulated = game.advance(SIM_DAYS)
+    final_day = last_day or sowing_date
+    final_state: Dict[str, float] = game.get_state() if days_simulated else {}
 
-    for _ in range(SIM_DAYS):
-        day, state = game.tick()
-        days_simulated += 1
-        final_day = day
-        final_state = state
-        if game.model is not None and game.model.flag_terminate:
-            break
-
-    return {
-        "crop": crop_name,
-        "sowing_date": sowing_date.isoformat(),
-        "days_simulated": days_simulated,
-        "final_day": final_day.isoformat(),
-        "fertilizer_applied": fertilizer_amount,
-        "irrigation_applied": irrigation_amount,
-        "final_state": final_state,
-    }
-    fertilizer_amount = _resolve_amount(payload.get("fertilizer"), FERTILIZER_PRESETS, "fertilizer")
-    irrigation_amount = _resolve_amount(payload.get("irrigation"), IRRIGATION_PRESETS, "irrigation")
-    irrigation_eff = payload.get("irrigation_efficiency")
-    if irrigation_eff is None:
-        irrigation_eff = 0.75
-    else:
-        irrigation_eff = max(0.0, min(1.0, float(irrigation_eff)))
-    lat = float(payload.get("lat", DEFAULT_LAT))
-    lon = float(payload.get("lon", DEFAULT_LON))
-    elev = float(payload.get("elev", DEFAULT_ELEV))
-    game = CropGame(lat=lat, lon=lon, elev=elev)
-    game.plant(crop_name=crop_name, sowing_date=sowing_date)
-    if irrigation_amount > 0.0:
-        game.water(irrigation_amount, efficiency=irrigation_eff)
-    if fertilizer_amount > 0.0:
-        game.fertilize(fertilizer_amount)
-    final_day = sowing_date
-    final_state: Dict[str, float] = {}
-    days_simulated = 0
-    for _ in range(SIM_DAYS):
-        day, state = game.tick()
-        days_simulated += 1
-        final_day = day
-        final_state = state
-        if game.model is not None and game.model.flag_terminate:
-            break
-    return {
+    result = {
         "crop": crop_name,
         "sowing_date": sowing_date.isoformat(),
         "days_simulated": days_simulated,
@@ -585,18 +1342,166 @@ def simulate_game(payload: Dict[str, Any]) -> Dict[str, Any]:
         "irrigation_applied": irrigation_amount,
         "final_state": final_state,
     }
+    if game.policies:
+        result["policies"] = [policy.describe() for policy in game.policies]
+    if record:
+        result["series"] = game.recorder.export(record)
+    return result
+
+
+_SIM_POOL: Optional[ProcessPoolExecutor] = None
+_SIM_POOL_LOCK = threading.Lock()
+
+
+def _warm_worker() -> None:
+    get_crop_catalogue(ModelType).load()
+    get_weather_cache()
+
+
+def _get_sim_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    global _SIM_POOL
+    with _SIM_POOL_LOCK:
+        if _SIM_POOL is None:
+            _SIM_POOL = ProcessPoolExecutor(
+                max_workers=max_workers or BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _SIM_POOL
+
+
+def shutdown_sim_pool() -> None:
+    global _SIM_POOL
+    with _SIM_POOL_LOCK:
+        if _SIM_POOL is not None:
+            _SIM_POOL.shutdown(wait=False, cancel_futures=True)
+            _SIM_POOL = None
+
+
+def _simulate_scenario(payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return {"ok": True, "result": simulate_game(payload)}
+    except Exception as exc:
+        return {"ok": False, "error": str(exc)}
 
 
-def _handle_request(session: Dict[str, Any], raw: str) -> Dict[str, Any]:
+def simulate_many(payloads: Iterable[Dict[str, Any]], max_workers: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Run simulate payloads on the shared worker pool, yielding (index, outcome) as each finishes.
+
+    Workers are spawned once and stay warm across batches; ``max_workers`` only applies when
+    the pool is first created. Each outcome is ``{"ok": True, "result": ...}`` or
+    ``{"ok": False, "error": ...}``.
+    """
+    pool = _get_sim_pool(max_workers)
+    futures = {pool.submit(_simulate_scenario, dict(payload)): index for index, payload in enumerate(payloads)}
+    try:
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:
+                outcome = {"ok": False, "error": str(exc)}
+            yield index, outcome
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _expand_scenarios(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    base = {key: value for key, value in payload.items() if key not in {"action", "scenarios", "grid"}}
+    scenarios: List[Dict[str, Any]] = []
+    listed = payload.get("scenarios") or []
+    if not isinstance(listed, list):
+        raise ValueError("'scenarios' must be a list of objects")
+    grid = payload.get("grid")
+    if grid and not isinstance(grid, dict):
+        raise ValueError("'grid' must map field names to lists of values")
+    keys = list(grid.keys()) if grid else []
+    values = [value if isinstance(value, list) else [value] for value in grid.values()] if grid else []
+    # Size the batch before expanding anything; a small grid can describe a huge product.
+    total = len(listed) + (math.prod(len(value) for value in values) if values else 0)
+    if total > MAX_BATCH_SCENARIOS:
+        raise ValueError(f"Batch too large: {total} scenarios (max {MAX_BATCH_SCENARIOS})")
+    for item in listed:
+        if not isinstance(item, dict):
+            raise ValueError("Each scenario must be a JSON object")
+        merged = dict(base)
+        merged.update(item)
+        scenarios.append(merged)
+    if values:
+        for combo in itertools.product(*values):
+            merged = dict(base)
+            merged.update(zip(keys, combo))
+            scenarios.append(merged)
+    if not scenarios:
+        raise ValueError("simulate_batch requires 'scenarios' or 'grid'")
+    return scenarios
+
+
+def _handle_simulate_batch(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    scenarios = _expand_scenarios(payload)
+    return _stream_batch(scenarios)
+
+
+def _stream_batch(scenarios: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    failed = 0
+    for index, outcome in simulate_many(scenarios):
+        if not outcome.get("ok"):
+            failed += 1
+        item = {"index": index, "scenario": scenarios[index]}
+        item.update(outcome)
+        yield item
+    return {"message": "batch complete", "scenarios": len(scenarios), "failed": failed}
+
+
+def _handle_request(session: Dict[str, Any], raw: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     payload = _parse_payload(raw)
     action_value = payload.get("action")
     if action_value is None:
         raise ValueError("Missing 'action' field in request")
     action = str(action_value).lower()
+    if meta is not None:
+        meta["action"] = action
+    result = _dispatch(session, action, payload)
+    if action in _STATE_CHANGING_ACTIONS or (action == "policies" and "policies" in payload):
+        force = action not in {"tick", "step", "advance"}
+        if isinstance(result, GeneratorType):
+            return _checkpoint_after(session, result, force)
+        session["checkpoint_dirty"] = True
+        _checkpoint_session(session, force=force)
+    return result
+
+
+def _checkpoint_after(session: Dict[str, Any], stream: Iterator[Dict[str, Any]], force: bool) -> Iterator[Dict[str, Any]]:
+    summary = yield from stream
+    session["checkpoint_dirty"] = True
+    _checkpoint_session(session, force=force)
+    return summary
+
+
+# Actions after which the session's checkpoint is stale. Ticks are written every
+# CHECKPOINT_EVERY ticks; the others (rare, user-driven) are written immediately.
+# "policies" only counts when it replaces the policies, not when it lists them.
+_STATE_CHANGING_ACTIONS = {"init", "initialize", "reset", "tick", "step", "advance", "water", "fertilize", "fertilise", "fork", "restore", "cancel"}
+
+
+# Every action _dispatch understands; anything else is labelled "unknown" in the metrics so
+# clients cannot grow the label set.
+_KNOWN_ACTIONS = frozenset({
+    "init", "initialize", "reset", "tick", "step", "advance", "status", "state", "water", "fertilize",
+    "fertilise", "simulate", "simulate_batch", "metrics", "stats", "snapshot", "fork", "restore", "resume",
+    "series", "history", "hello", "cancel", "prefetch", "actions", "schedule", "policies",
+})
+
+
+def _dispatch(session: Dict[str, Any], action: str, payload: Dict[str, Any]) -> Any:
     if action in {"init", "initialize", "reset"}:
         return _handle_init(session, payload)
     if action in {"tick", "step", "advance"}:
         steps = int(payload.get("steps") or 1)
+        every = int(payload.get("every") or 0)
+        if payload.get("stream") or every > 0:
+            return _handle_tick_stream(session, steps, max(1, every))
         return _handle_tick(session, steps)
     if action in {"status", "state"}:
         return _handle_status(session)
@@ -606,11 +1511,36 @@ def _handle_request(session: Dict[str, Any], raw: str) -> Dict[str, Any]:
         return _handle_fertilize(session, payload)
     if action == "simulate":
         return simulate_game(payload)
+    if action == "simulate_batch":
+        return _handle_simulate_batch(payload)
+    if action in {"metrics", "stats"}:
+        return _handle_metrics(payload)
+    if action == "snapshot":
+        return _handle_snapshot(session, payload)
+    if action in {"fork", "restore"}:
+        return _handle_fork(session, payload)
+    if action == "resume":
+        return _handle_resume(session, payload)
+    if action in {"series", "history"}:
+        return _handle_series(session, payload)
+    if action == "hello":
+        return _handle_hello(session, payload)
+    if action == "cancel":
+        return _handle_cancel(session, payload)
+    if action == "prefetch":
+        return _handle_prefetch(payload)
+    if action in {"actions", "schedule"}:
+        return {"actions": _require_game(session).actions.pending()}
+    if action == "policies":
+        return _handle_policies(session, payload)
     raise ValueError(f"Unsupported action: {action}")
 
 
 
 def _handle_init(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    requested_id = _check_session_id(payload["session_id"]) if payload.get("session_id") else None
+    if requested_id:
+        _check_session_available(session, requested_id)
     date_value = payload.get("date")
     if not date_value:
         previous = session.get("payload") or {}
@@ -630,8 +1560,17 @@ def _handle_init(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
     lon = float(payload.get("lon", DEFAULT_LON))
     elev = float(payload.get("elev", DEFAULT_ELEV))
 
-    game = CropGame(lat=lat, lon=lon, elev=elev)
+    previous_variables = (session.get("payload") or {}).get("variables")
+    variables = _parse_variables(payload.get("variables", previous_variables))
+    weather_format = str(payload.get("weather_format") or "string").lower()
+    if weather_format not in {"string", "object"}:
+        raise ValueError("weather_format must be 'string' or 'object'.")
+    game = CropGame(lat=lat, lon=lon, elev=elev, variables=variables)
+    game.weather_format = weather_format
     game.plant(crop_name=crop_name, sowing_date=sowing_date)
+    if _parse_record(payload.get("record")):
+        game.record()
+    game.set_policies(_parse_policies(payload.get("policies")))
 
     if irrigation_amount > 0.0:
         game.water(irrigation_amount, efficiency=irrigation_eff)
@@ -640,11 +1579,20 @@ def _handle_init(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
 
 
 
-    session.clear()
+    session_id = requested_id or session.get("session_id") or _new_session_id()
+    # Choosing an id opts in to resuming; sessions without one are dropped on disconnect.
+    resumable = bool(requested_id) or bool(session.get("resumable") and session_id == session.get("session_id"))
+    resume_token = secrets.token_urlsafe(RESUME_TOKEN_BYTES) if resumable and _session_store is not None else None
+    _adopt_session_id(session, session_id)
+    _reset_session(session)
     cached_payload = dict(payload)
     cached_payload["date"] = sowing_date.isoformat()
     cached_payload["crop"] = crop_name
+    cached_payload["variables"] = list(variables) if variables else None
     session.update({
+        "session_id": session_id,
+        "resumable": resumable,
+        "resume_digest": _token_digest(resume_token) if resume_token else None,
         "game": game,
         "ticks": 0,
         "payload": cached_payload,
@@ -652,7 +1600,12 @@ def _handle_init(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
         "crop": crop_name,
     })
 
-    return {"message": "initialized", "crop": crop_name, "sowing_date": sowing_date.isoformat(), "fertilizer_applied": fertilizer_amount, "irrigation_applied": irrigation_amount, "location": {"lat": lat, "lon": lon, "elev": elev}}
+    response = {"message": "initialized", "session_id": session_id, "crop": crop_name, "sowing_date": sowing_date.isoformat(), "fertilizer_applied": fertilizer_amount, "irrigation_applied": irrigation_amount, "location": {"lat": lat, "lon": lon, "elev": elev}}
+    if resume_token:
+        response["resume_token"] = resume_token
+    if game.policies:
+        response["policies"] = [policy.describe() for policy in game.policies]
+    return response
 
 
 def _handle_tick(session: Dict[str, Any], steps: int) -> Dict[str, Any]:
@@ -660,25 +1613,18 @@ def _handle_tick(session: Dict[str, Any], steps: int) -> Dict[str, Any]:
     if game is None:
         raise RuntimeError("Initialize the simulation before requesting ticks.")
 
-    steps = max(1, int(steps))
-    executed = 0
-    last_day = None
-    last_state: Dict[str, Any] = {}
-    finished = False
-
-    for _ in range(steps):
-        day, state = game.tick()
-        executed += 1
-        session["ticks"] = session.get("ticks", 0) + 1
-        last_day = day
-        last_state = state
-        finished = bool(game.model.flag_terminate if game.model is not None else False)
-        if finished:
-            break
-
+    # Only the last day is reported, so the intermediate days skip state extraction.
+    last_day, executed = game.advance(max(1, int(steps)))
+    session["ticks"] = session.get("ticks", 0) + executed
     if last_day is None:
         raise RuntimeError("No ticks executed.")
+    with METRICS.timer("tick_phase_seconds", phase="get_state"):
+        last_state = game.get_state()
+    return _tick_response(session, game, executed, last_day, last_state, game.finished)
 
+
+def _tick_response(session: Dict[str, Any], game: CropGame, executed: int, last_day: date,
+                   last_state: Dict[str, Any], finished: bool) -> Dict[str, Any]:
     metrics = _build_metrics(last_state)
     weather = _build_weather_payload(game, last_day, last_state)
     return {
@@ -692,6 +1638,132 @@ def _handle_tick(session: Dict[str, Any], steps: int) -> Dict[str, Any]:
     }
 
 
+def _handle_tick_stream(session: Dict[str, Any], steps: int, every: int) -> Iterator[Dict[str, Any]]:
+    """Tick like ``_handle_tick`` but stream each simulated day as a partial frame.
+
+    With ``every == 1`` each day is sent as one compact ``{tick, day, state}`` line; with a
+    larger ``every`` days are grouped into columnar blocks of that many rows. The final frame
+    is the same summary a plain tick returns.
+    """
+    game: CropGame = session.get("game")
+    if game is None:
+        raise RuntimeError("Initialize the simulation before requesting ticks.")
+    return _stream_ticks(session, game, max(1, int(steps)), every)
+
+
+def _stream_ticks(session: Dict[str, Any], game: CropGame, steps: int, every: int) -> Iterator[Dict[str, Any]]:
+    executed = 0
+    finished = False
+    rows: List[Tuple[int, date, Dict[str, Any]]] = []
+    for _ in range(steps):
+        day, state = game.tick()
+        executed += 1
+        session["ticks"] = session.get("ticks", 0) + 1
+        finished = game.finished
+        if every == 1:
+            yield {"tick": session["ticks"], "day": day.isoformat(), "state": state}
+        else:
+            rows.append((session["ticks"], day, state))
+            if len(rows) >= every:
+                yield _columnar_block(rows)
+                rows = []
+        if finished:
+            break
+    if rows:
+        yield _columnar_block(rows)
+    return _tick_response(session, game, executed, day, state, finished)
+
+
+def _columnar_block(rows: List[Tuple[int, date, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Pivot per-day states into one column per variable (missing values are null)."""
+    names: Dict[str, None] = {}
+    for _, _, state in rows:
+        names.update(dict.fromkeys(state))
+    return {
+        "ticks": [tick for tick, _, _ in rows],
+        "days": [day.isoformat() for _, day, _ in rows],
+        "columns": {name: [state.get(name) for _, _, state in rows] for name in names},
+    }
+
+
+
+
+def _parse_variables(value: Any) -> Optional[List[str]]:
+    """Normalise a client's ``variables`` list (JSON list or comma-separated string)."""
+    if value is None or value == "":
+        return None
+    names = value.split(",") if isinstance(value, str) else value
+    if not isinstance(names, (list, tuple)):
+        raise ValueError("'variables' must be a list of WOFOST variable names.")
+    parsed: List[str] = []
+    for name in names:
+        name = str(name).strip()
+        if not _VARIABLE_NAME_RE.match(name):
+            raise ValueError(f"Invalid variable name: {name!r}")
+        if name not in parsed:
+            parsed.append(name)
+    if len(parsed) > MAX_STATE_VARIABLES:
+        raise ValueError(f"At most {MAX_STATE_VARIABLES} variables can be requested.")
+    return parsed or None
+
+
+_VARIABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,31}$")
+
+
+def _parse_policies(value: Any) -> List[ManagementPolicy]:
+    """Build the ``policies`` list of an init/simulate payload (a single object is accepted too)."""
+    if not value:
+        return []
+    specs = [value] if isinstance(value, dict) else value
+    if not isinstance(specs, (list, tuple)):
+        raise ValueError("'policies' must be a list of policy objects.")
+    if len(specs) > MAX_POLICIES:
+        raise ValueError(f"At most {MAX_POLICIES} policies can be attached.")
+    return [ManagementPolicy.from_dict(spec) for spec in specs]
+
+
+def _handle_policies(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """List the session's policies, or replace them when the payload carries ``policies``."""
+    game = _require_game(session)
+    if "policies" in payload:
+        game.set_policies(_parse_policies(payload["policies"]))
+    return {"action": "policies", "policies": [policy.describe() for policy in game.policies]}
+
+
+def _parse_record(value: Any) -> Optional[str]:
+    """Map a ``record`` flag to a series format: true means base64, a string names the format."""
+    if not value:
+        return None
+    fmt = value.lower() if isinstance(value, str) else "base64"
+    if fmt not in SERIES_FORMATS:
+        raise ValueError(f"Unsupported series format '{value}'. Use one of: {', '.join(SERIES_FORMATS)}")
+    return fmt
+
+
+def _handle_series(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    game = _require_game(session)
+    if game.recorder is None:
+        raise RuntimeError("Recording is off for this session; pass 'record': true to init.")
+    return dict(game.recorder.export(_parse_record(payload.get("format") or True)), tick=session.get("ticks", 0))
+
+
+def _reset_session(session: Dict[str, Any]) -> None:
+    """Drop the session's game state but keep connection-level settings such as the protocol."""
+    kept = {key: session[key] for key in _CONNECTION_KEYS if key in session}
+    session.clear()
+    session.update(kept)
+
+
+_CONNECTION_KEYS = ("protocol",)
+
+
+def _handle_hello(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Negotiate the wire protocol; the switch applies from the request after this one."""
+    protocol = str(payload.get("protocol") or PROTOCOL_JSON_LINES).lower()
+    if protocol not in _CODECS:
+        raise ValueError(f"Unsupported protocol '{protocol}'. Available: {', '.join(_CODECS)}")
+    session["protocol"] = protocol
+    return {"protocol": protocol, "float64_array_ext": FLOAT64_ARRAY_EXT if protocol == PROTOCOL_MSGPACK else None}
 
 
 def _require_game(session: Dict[str, Any]) -> CropGame:
@@ -735,7 +1807,8 @@ def _handle_water(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
         else:
             target_day = parsed
 
-    game.water(amount_value, when=target_day, efficiency=eff_value)
+    every_days, until = _parse_recurrence(payload)
+    action_id = game.water(amount_value, when=target_day, efficiency=eff_value, every_days=every_days, until=until)
 
     auto_steps = payload.get("auto_steps")
     try:
@@ -751,6 +1824,7 @@ def _handle_water(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
         result.update({
             "action": "water",
             "message": "water applied",
+            "action_id": action_id,
             "amount_cm": amount_value,
             "efficiency": eff_value,
         })
@@ -770,7 +1844,8 @@ def _handle_water(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str,
         "state": state,
         "metrics": metrics,
         "weather": _build_weather_payload(game, last_day or day, state),
-        "finished": bool(game.model.flag_terminate if game.model is not None else False),
+        "finished": game.finished,
+        "action_id": action_id,
         "amount_cm": amount_value,
         "efficiency": eff_value,
     }
@@ -810,7 +1885,8 @@ def _handle_fertilize(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[
         else:
             target_day = parsed
 
-    game.fertilize(amount_value, when=target_day, nh4_fraction=nh4_value)
+    every_days, until = _parse_recurrence(payload)
+    action_id = game.fertilize(amount_value, when=target_day, nh4_fraction=nh4_value, every_days=every_days, until=until)
 
     auto_steps = payload.get("auto_steps")
     try:
@@ -826,6 +1902,7 @@ def _handle_fertilize(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[
         result.update({
             "action": "fertilize",
             "message": "fertilizer applied",
+            "action_id": action_id,
             "amount_kg_ha": amount_value,
             "nh4_fraction": nh4_value,
         })
@@ -845,12 +1922,108 @@ def _handle_fertilize(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[
         "state": state,
         "metrics": metrics,
         "weather": _build_weather_payload(game, last_day or day, state),
-        "finished": bool(game.model.flag_terminate if game.model is not None else False),
+        "finished": game.finished,
+        "action_id": action_id,
         "amount_kg_ha": amount_value,
         "nh4_fraction": nh4_value,
     }
 
 
+def _parse_recurrence(payload: Dict[str, Any]) -> Tuple[Optional[int], Optional[date]]:
+    """``every_days``/``until`` of a water or fertilize request (both optional)."""
+    every = payload.get("every_days")
+    if every is None:
+        return None, None
+    try:
+        every_days = int(every)
+    except (TypeError, ValueError):
+        raise ValueError("every_days must be a whole number of days.")
+    if every_days < 1:
+        raise ValueError("every_days must be at least 1.")
+    until = payload.get("until")
+    return every_days, _parse_date(until) if until else None
+
+
+def _handle_prefetch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Start loading a season's weather into the cache before the client sends ``init``."""
+    sowing_date = _parse_date(payload.get("date"))
+    lat = float(payload.get("lat", DEFAULT_LAT))
+    lon = float(payload.get("lon", DEFAULT_LON))
+    start = sowing_date - timedelta(days=1)
+    end = sowing_date + timedelta(days=SIM_DAYS + WEATHER_MARGIN_DAYS)
+    queued = prefetch_weather(lat, lon, start, end) is not None
+    return {"action": "prefetch", "queued": queued, "start": start.isoformat(), "end": end.isoformat()}
+
+
+def _handle_cancel(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    game = _require_game(session)
+    try:
+        action_id = int(payload.get("action_id"))
+    except (TypeError, ValueError):
+        raise ValueError("Cancel requires a numeric 'action_id'.")
+    return {"action": "cancel", "action_id": action_id, "cancelled": game.cancel_action(action_id), "pending": len(game.actions)}
+
+
+def _handle_metrics(payload: Dict[str, Any]) -> Dict[str, Any]:
+    if str(payload.get("format") or "").lower() == "prometheus":
+        return {"format": "prometheus", "text": METRICS.prometheus()}
+    if payload.get("reset"):
+        snapshot = METRICS.snapshot()
+        METRICS.reset()
+        return snapshot
+    return METRICS.snapshot()
+
+
+def _handle_snapshot(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    game = _require_game(session)
+    ticks = session.get("ticks", 0)
+    name = str(payload.get("name") or f"tick-{ticks}")
+    snapshots: Dict[str, Tuple[GameSnapshot, int]] = session.setdefault("snapshots", {})
+    snapshots.pop(name, None)
+    snapshots[name] = (game.snapshot(), ticks)
+    while len(snapshots) > MAX_SNAPSHOTS:
+        snapshots.pop(next(iter(snapshots)))
+    return {"snapshot": name, "tick": ticks, "snapshots": list(snapshots)}
+
+
+def _handle_fork(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the session's game with a fresh branch of a snapshot (default: the latest)."""
+    snapshots: Dict[str, Tuple[GameSnapshot, int]] = session.get("snapshots") or {}
+    if not snapshots:
+        raise RuntimeError("Take a snapshot before forking.")
+    name = payload.get("snapshot") or payload.get("name") or next(reversed(snapshots))
+    if name not in snapshots:
+        raise ValueError(f"Unknown snapshot '{name}'. Available: {', '.join(snapshots)}")
+    snapshot, ticks = snapshots[name]
+    session["game"] = snapshot.fork()
+    session["ticks"] = ticks
+    return dict(_handle_status(session), forked_from=name)
+
+
+def _handle_resume(session: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Adopt a checkpointed session by id and resume token, picking up where it was last saved."""
+    if _session_store is None:
+        raise RuntimeError("Session persistence is disabled on this server.")
+    session_id = _check_session_id(payload.get("session_id"))
+    resume_token = str(payload.get("resume_token") or "")
+    if not resume_token:
+        raise ValueError("resume requires the 'resume_token' returned by init.")
+    _check_session_available(session, session_id, resuming=True)
+    if session_id == session.get("session_id") and session.get("game") is not None:
+        _checkpoint_session(session, force=True)
+    with METRICS.timer("resume_seconds"):
+        restored = _session_store.load(session_id, resume_token)
+    if restored is None:
+        raise ValueError(f"No saved session '{session_id}'.")
+    _adopt_session_id(session, session_id)
+    _reset_session(session)
+    session.update(restored)
+    session["resumable"] = True
+    session["checkpoint_tick"] = session.get("ticks", 0)
+    session["checkpoint_dirty"] = False
+    return dict(_handle_status(session), session_id=session_id, resumed=True)
+
+
 def _handle_status(session: Dict[str, Any]) -> Dict[str, Any]:
     game: CropGame = session.get("game")
     if game is None:
@@ -869,51 +2042,384 @@ def _handle_status(session: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _handle_client(connection: socket.socket, address) -> None:
-    print(f"Client connected: {address}")
-    session: Dict[str, Any] = {"game": None, "ticks": 0}
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_body_sample_rate = LOG_BODY_SAMPLE_RATE
+
+
+def configure_logging(level: Any = LOG_LEVEL, sample_rate: float = LOG_BODY_SAMPLE_RATE, stream=None) -> None:
+    """Send server logs through a queue so socket threads never block on console I/O.
+
+    Request and response bodies are logged at DEBUG for a ``sample_rate`` fraction of
+    requests; every request also gets one compact INFO timing record.
+    """
+    global _log_listener, _body_sample_rate
+    if _log_listener is not None:
+        _log_listener.stop()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    _log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    _body_sample_rate = max(0.0, min(1.0, float(sample_rate)))
+    _log_listener.start()
+
+
+def _sample_bodies() -> bool:
+    return _body_sample_rate > 0.0 and logger.isEnabledFor(logging.DEBUG) and random.random() < _body_sample_rate
+
+
+def _clip(text: Any) -> str:
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", "replace")
+    text = str(text).rstrip("\n")
+    if len(text) > LOG_BODY_MAX_CHARS:
+        return text[:LOG_BODY_MAX_CHARS] + f"...(+{len(text) - LOG_BODY_MAX_CHARS} chars)"
+    return text
+
+
+def _new_session_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class _LineFramer:
+    """Split a byte stream into newline-terminated lines in linear time.
+
+    Data is appended to one bytearray and the newline search resumes where the previous one
+    stopped; consumed bytes are dropped once per feed. A line longer than ``max_line`` is
+    discarded and reported as ``None`` so the caller can reject it instead of buffering it.
+    """
+    def __init__(self, max_line: int = MAX_LINE_BYTES) -> None:
+        self.max_line = max_line
+        self._buffer = bytearray()
+        self._scan = 0
+        self._discarding = False
+    def feed(self, chunk: bytes) -> List[Optional[bytes]]:
+        buffer = self._buffer
+        buffer += chunk
+        lines: List[Optional[bytes]] = []
+        start = 0
+        while True:
+            end = buffer.find(b"\n", self._scan)
+            if end < 0:
+                break
+            if self._discarding:
+                self._discarding = False
+            elif end - start > self.max_line:
+                lines.append(None)
+            else:
+                lines.append(bytes(buffer[start:end]))
+            start = end + 1
+            self._scan = start
+        if start:
+            del buffer[:start]
+        self._scan = len(buffer)
+        if len(buffer) > self.max_line:
+            if not self._discarding:
+                lines.append(None)
+                self._discarding = True
+            buffer.clear()
+            self._scan = 0
+        return lines
+    def remainder(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._scan = 0
+        return data
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+class _LengthFramer:
+    """Split a byte stream into frames prefixed with a 4-byte big-endian length.
+
+    A frame longer than ``max_frame`` is skipped without being buffered and reported as
+    ``None``, like an oversized line.
+    """
+    def __init__(self, max_frame: int = MAX_LINE_BYTES) -> None:
+        self.max_frame = max_frame
+        self._buffer = bytearray()
+        self._skip = 0
+    def feed(self, chunk: bytes) -> List[Optional[bytes]]:
+        buffer = self._buffer
+        buffer += chunk
+        frames: List[Optional[bytes]] = []
+        start = 0
+        while True:
+            if self._skip:
+                skipped = min(self._skip, len(buffer) - start)
+                start += skipped
+                self._skip -= skipped
+                if self._skip:
+                    break
+            if len(buffer) - start < _FRAME_HEADER.size:
+                break
+            (length,) = _FRAME_HEADER.unpack_from(buffer, start)
+            start += _FRAME_HEADER.size
+            if length > self.max_frame:
+                frames.append(None)
+                self._skip = length
+                continue
+            if len(buffer) - start < length:
+                start -= _FRAME_HEADER.size
+                break
+            frames.append(bytes(buffer[start:start + length]))
+            start += length
+        if start:
+            del buffer[:start]
+        return frames
+    def remainder(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class _JsonLinesCodec:
+    name = PROTOCOL_JSON_LINES
+    def framer(self, max_bytes: int) -> _LineFramer:
+        return _LineFramer(max_bytes)
+    def decode(self, frame: bytes) -> str:
+        return frame.decode("utf-8").strip()
+    def encode(self, response: Any) -> bytes:
+        return _encode_frame(response)
+    def reframe(self, frames: List[Optional[bytes]]) -> bytes:
+        return b"".join(frame + b"\n" for frame in frames if frame is not None)
+
+
+class _MsgpackCodec:
+    """Length-prefixed MessagePack; float arrays travel as FLOAT64_ARRAY_EXT buffers."""
+    name = PROTOCOL_MSGPACK
+    def framer(self, max_bytes: int) -> _LengthFramer:
+        return _LengthFramer(max_bytes)
+    def decode(self, frame: bytes) -> Any:
+        return unpack_msgpack(frame)
+    def encode(self, response: Any) -> bytes:
+        body = pack_msgpack(response, default=_json_default)
+        return _FRAME_HEADER.pack(len(body)) + body
+    def reframe(self, frames: List[Optional[bytes]]) -> bytes:
+        return b"".join(_FRAME_HEADER.pack(len(frame)) + frame for frame in frames if frame is not None)
+
+
+_CODECS: Dict[str, Any] = {PROTOCOL_JSON_LINES: _JsonLinesCodec()}
+if msgpack_available():
+    _CODECS[PROTOCOL_MSGPACK] = _MsgpackCodec()
+
+
+class _ClientProtocol:
+    """Framing and encoding for one connection.
+
+    Every connection starts on newline-delimited JSON and the greeting lists the protocols
+    on offer. A ``hello`` request can switch the session to another one; the switch takes
+    effect once the hello response has been sent, and any bytes already received after the
+    hello are re-read with the new framing.
+    """
+    def __init__(self, session: Dict[str, Any], max_bytes: int = MAX_LINE_BYTES) -> None:
+        self.session = session
+        self.max_bytes = max_bytes
+        self.codec = _CODECS[PROTOCOL_JSON_LINES]
+        self.framer = self.codec.framer(max_bytes)
+    def greeting(self) -> bytes:
+        return self.codec.encode({"ok": True, "message": "ready", "protocols": list(_CODECS)})
+    def feed(self, chunk: bytes) -> Iterator[Iterator[bytes]]:
+        """Yield, per complete request in ``chunk``, an iterator over its encoded response frames."""
+        frames = self.framer.feed(chunk)
+        for index, frame in enumerate(frames):
+            responses = self._respond(frame)
+            if responses is not None:
+                yield responses
+            wanted = self.session.get("protocol", PROTOCOL_JSON_LINES)
+            if wanted != self.codec.name:
+                leftover = self.codec.reframe(frames[index + 1:]) + self.framer.remainder()
+                self.codec = _CODECS[wanted]
+                self.framer = self.codec.framer(self.max_bytes)
+                yield from self.feed(leftover)
+                return
+    def _respond(self, frame: Optional[bytes]) -> Optional[Iterator[bytes]]:
+        codec = self.codec
+        if frame is None:
+            return iter([codec.encode(_oversized_response(self.max_bytes))])
+        try:
+            request = codec.decode(frame)
+        except Exception as exc:
+            return iter([codec.encode({"ok": False, "error": f"Malformed {codec.name} frame: {exc or type(exc).__name__}"})])
+        if not request:
+            return None
+        return _iter_frames(self.session, request, codec, len(frame))
+
+
+def _oversized_response(max_line: int) -> Dict[str, Any]:
+    return {"ok": False, "error": f"Request line exceeds {max_line} bytes"}
+
+
+def _iter_responses(session: Dict[str, Any], raw: str, meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the response frames for one request line.
+
+    Plain handlers produce a single frame. Streaming handlers return a generator: each item it
+    yields goes out as a ``"partial": true`` frame and its return value becomes the final frame.
+    """
+    try:
+        result = _handle_request(session, raw, meta)
+        if isinstance(result, GeneratorType):
+            while True:
+                try:
+                    item = next(result)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                yield {"ok": True, "partial": True, "result": item}
+        response = {"ok": True, "result": result}
+    except Exception as exc:
+        response = {"ok": False, "error": str(exc)}
+    yield response
+
+
+def _iter_frames(session: Dict[str, Any], raw: Any, codec: Any = None, bytes_in: Optional[int] = None) -> Iterator[bytes]:
+    """Encode the responses for one request and log a timing record once they are sent."""
+    codec = codec or _CODECS[PROTOCOL_JSON_LINES]
+    started = time.perf_counter()
+    session_id = session.get("session_id", "-")
+    sampled = _sample_bodies()
+    if sampled:
+        logger.debug("request session=%s body=%s", session_id, _clip(raw))
+    meta: Dict[str, Any] = {}
+    frames = 0
+    out_bytes = 0
+    ok = False
+    for response in _iter_responses(session, raw, meta):
+        encode_started = time.perf_counter()
+        frame = codec.encode(response)
+        METRICS.observe("encode_seconds", time.perf_counter() - encode_started)
+        frames += 1
+        out_bytes += len(frame)
+        ok = bool(response.get("ok"))
+        if sampled:
+            logger.debug("response session=%s body=%s", session_id, _clip(frame))
+        yield frame
+    duration = time.perf_counter() - started
+    action = meta.get("action", "-")
+    label = action if action in _KNOWN_ACTIONS or action == "-" else "unknown"
+    METRICS.observe("request_seconds", duration, action=label)
+    METRICS.incr("requests", action=label, ok="true" if ok else "false")
+    METRICS.incr("response_bytes", out_bytes, action=label)
+    logger.info(
+        "request action=%s session=%s duration_ms=%.2f bytes_in=%d bytes_out=%d frames=%d ok=%s",
+        action, session_id, duration * 1000.0, len(raw) if bytes_in is None else bytes_in, out_bytes, frames, ok,
+    )
+
+
+def _handle_client(connection: socket.socket, address, max_line: int = MAX_LINE_BYTES) -> None:
+    session: Dict[str, Any] = {"game": None, "ticks": 0, "session_id": _new_session_id()}
+    logger.info("client connected address=%s session=%s", address, session["session_id"])
     try:
         with connection:
-            greeting = json.dumps({"ok": True, "message": "ready"}, default=_json_default) + "\n"
-            connection.sendall(greeting.encode("utf-8"))
-            print(f"Handshake to {address}: {greeting.strip()}", flush=True)
-            buffer = b""
+            protocol = _ClientProtocol(session, max_line)
+            connection.sendall(protocol.greeting())
             while True:
                 chunk = connection.recv(BUFFER_SIZE)
                 if not chunk:
                     break
-                buffer += chunk
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    raw = line.decode("utf-8").strip()
-                    if not raw:
-                        continue
-                    print(f"Request from {address}: {raw}", flush=True)
-                    try:
-                        result = _handle_request(session, raw)
-                        response = {"ok": True, "result": result}
-                    except Exception as exc:
-                        response = {"ok": False, "error": str(exc)}
-                    payload = json.dumps(response, default=_json_default) + "\n"
-                    connection.sendall(payload.encode("utf-8"))
-                    print(f"Response to {address}: {payload}", flush=True)
-    except Exception as exc:
-        import traceback
-        traceback.print_exc()
-        print(f"Unhandled error for {address}: {exc}", flush=True)
+                for frames in protocol.feed(chunk):
+                    for frame in frames:
+                        connection.sendall(frame)
+    except Exception:
+        logger.exception("unhandled error address=%s session=%s", address, session["session_id"])
     finally:
-        print(f"Client disconnected: {address}")
-
-def serve_forever(host: str = HOST, port: int = PORT) -> None:
+        _close_session(session)
+        logger.info("client disconnected address=%s session=%s", address, session["session_id"])
+
+def serve_forever(host: str = HOST, port: int = PORT, max_line: int = MAX_LINE_BYTES, session_dir: Optional[str] = SESSION_DIR) -> None:
+    if _log_listener is None:
+        configure_logging()
+    get_crop_catalogue(ModelType).load()
+    if session_dir:
+        set_session_store(SessionStore(session_dir))
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
         server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server.bind((host, port))
         server.listen()
-        print(f"Python crop server listening on {host}:{port}")
+        logger.info("Python crop server listening on %s:%s", host, port)
         while True:
             conn, addr = server.accept()
-            thread = threading.Thread(target=_handle_client, args=(conn, addr), daemon=True)
+            thread = threading.Thread(target=_handle_client, args=(conn, addr, max_line), daemon=True)
             thread.start()
 
+def _next_frame(frames: Iterator[bytes]) -> Optional[bytes]:
+    return next(frames, None)
+
+async def _handle_client_async(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: ThreadPoolExecutor,
+                               max_line: int = MAX_LINE_BYTES) -> None:
+    address = writer.get_extra_info("peername")
+    session: Dict[str, Any] = {"game": None, "ticks": 0, "session_id": _new_session_id()}
+    logger.info("client connected address=%s session=%s", address, session["session_id"])
+    loop = asyncio.get_running_loop()
+    try:
+        protocol = _ClientProtocol(session, max_line)
+        writer.write(protocol.greeting())
+        await writer.drain()
+        while True:
+            chunk = await reader.read(BUFFER_SIZE)
+            if not chunk:
+                break
+            for frames in protocol.feed(chunk):
+                # Handlers (WOFOST ticks, weather fetches, batch streams) run on the bounded
+                # executor so the event loop only ever waits on sockets.
+                while True:
+                    frame = await loop.run_in_executor(executor, _next_frame, frames)
+                    if frame is None:
+                        break
+                    writer.write(frame)
+                    await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except Exception:
+        logger.exception("unhandled error address=%s session=%s", address, session["session_id"])
+    finally:
+        writer.close()
+        await loop.run_in_executor(executor, functools.partial(_close_session, session))
+        logger.info("client disconnected address=%s session=%s", address, session["session_id"])
+
+async def serve_async(host: str = HOST, port: int = PORT, max_workers: int = ASYNC_TICK_WORKERS,
+                      max_line: int = MAX_LINE_BYTES, session_dir: Optional[str] = SESSION_DIR) -> None:
+    """Serve the same newline-delimited JSON protocol from one asyncio event loop.
+
+    Idle connections cost a coroutine rather than a thread; request handling is bounded by
+    ``max_workers`` executor threads shared across all clients.
+    """
+    if _log_listener is None:
+        configure_logging()
+    get_crop_catalogue(ModelType).load()
+    if session_dir:
+        set_session_store(SessionStore(session_dir))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crop-tick")
+    server = await asyncio.start_server(lambda r, w: _handle_client_async(r, w, executor, max_line), host, port)
+    logger.info("Python crop server listening on %s:%s (asyncio, %d workers)", host, port, max_workers)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="SMARTFarming crop simulation server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="serve from an asyncio event loop")
+    parser.add_argument("--workers", type=int, default=ASYNC_TICK_WORKERS, help="executor threads in --async mode")
+    parser.add_argument("--max-line-bytes", type=int, default=MAX_LINE_BYTES, help="reject request lines longer than this")
+    parser.add_argument("--session-dir", default=SESSION_DIR, help="keep session checkpoints in this directory (off by default)")
+    parser.add_argument("--json-encoder", default=None, help="auto (default), orjson, msgspec or json")
+    parser.add_argument("--log-level", default=LOG_LEVEL)
+    parser.add_argument("--log-sample", type=float, default=LOG_BODY_SAMPLE_RATE,
+                        help="fraction of request/response bodies logged at DEBUG")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_sample)
+    encoder = set_json_encoder(args.json_encoder)
+    logger.info("response encoder: %s", encoder.name)
+    if args.use_async:
+        asyncio.run(serve_async(args.host, args.port, args.workers, args.max_line_bytes, args.session_dir))
+    else:
+        serve_forever(args.host, args.port, args.max_line_bytes, args.session_dir)
+
 if __name__ == "__main__":
-    serve_forever()
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Histogram upper bounds in seconds, roughly log-spaced from 50 us to 60 s.
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are estimated from bucket bounds."""
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(upper, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": mean,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of labelled histograms and counters, kept entirely in-process."""
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.started = time.time()
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    def incr(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = {
+                name: [dict(labels=dict(key), **histogram.snapshot()) for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+        return {"uptime_s": time.time() - self.started, "histograms": histograms, "counters": counters}
+
+    def prometheus(self, prefix: str = "smartfarming") -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{_render_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{metric}_bucket{_render_labels(key, le=repr(bound))} {cumulative}")
+                    lines.append(f"{metric}_bucket{_render_labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{metric}_sum{_render_labels(key)} {histogram.total}")
+                    lines.append(f"{metric}_count{_render_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _render_labels(key: LabelKey, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import array
+import base64
+import csv
+import io
+import math
+import struct
+import sys
+from datetime import date
+from typing import Any, Dict, Iterable, List, Sequence
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - numpy is optional
+    _np = None
+
+try:
+    import pyarrow as _pa
+except ImportError:  # pragma: no cover - pyarrow is optional
+    _pa = None
+
+INITIAL_CAPACITY = 128
+
+SERIES_FORMATS = ("base64", "columns", "json", "csv")
+
+# Column holding each row's date as a proleptic Gregorian ordinal (date.toordinal()).
+DAY_COLUMN = "day"
+
+
+class SeriesRecorder:
+    """Column-per-variable daily time series for one simulated season.
+
+    Values are stored as float64 (NaN when a variable is missing or not numeric) in
+    preallocated NumPy arrays that double when full, or in ``array.array('d')`` when NumPy
+    is not installed. Nothing per-day is kept as a Python dict.
+    """
+    def __init__(self, variables: Sequence[str], capacity: int = INITIAL_CAPACITY) -> None:
+        self.variables: List[str] = [name for name in variables if name != DAY_COLUMN]
+        self.rows = 0
+        self._capacity = max(1, int(capacity))
+        names = [DAY_COLUMN] + self.variables
+        if _np is not None:
+            self._columns = {name: _np.empty(self._capacity, dtype=_np.float64) for name in names}
+        else:
+            self._columns = {name: array.array("d") for name in names}
+
+    def record(self, day: date, state: Dict[str, Any]) -> None:
+        if _np is not None:
+            if self.rows == self._capacity:
+                self._grow()
+            row = self.rows
+            self._columns[DAY_COLUMN][row] = day.toordinal()
+            for name in self.variables:
+                self._columns[name][row] = _as_float(state.get(name))
+        else:
+            self._columns[DAY_COLUMN].append(day.toordinal())
+            for name in self.variables:
+                self._columns[name].append(_as_float(state.get(name)))
+        self.rows += 1
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = _np.empty(self._capacity, dtype=_np.float64)
+            grown[:self.rows] = column[:self.rows]
+            self._columns[name] = grown
+
+    def copy(self) -> "SeriesRecorder":
+        clone = SeriesRecorder(self.variables, capacity=self._capacity)
+        clone.rows = self.rows
+        clone._columns = {name: column[:] if _np is None else column.copy() for name, column in self._columns.items()}
+        return clone
+
+    def column(self, name: str) -> Any:
+        """Recorded values of one column (a NumPy view, or an array.array copy)."""
+        return self._columns[name][:self.rows]
+
+    def days(self) -> List[date]:
+        return [date.fromordinal(int(value)) for value in self.column(DAY_COLUMN)]
+
+    def _column_bytes(self, name: str) -> bytes:
+        values = self.column(name)
+        if _np is not None:
+            return values.astype("<f8", copy=False).tobytes()
+        if sys.byteorder == "big":
+            values = array.array("d", values)
+            values.byteswap()
+        return values.tobytes()
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Plain JSON lists: ISO days plus one list per variable (NaN becomes null)."""
+        return {
+            "days": [day.isoformat() for day in self.days()],
+            "columns": {name: [None if math.isnan(value) else float(value) for value in self.column(name)] for name in self.variables},
+        }
+
+    def to_base64(self) -> Dict[str, Any]:
+        """All columns as one base64 block of little-endian float64, column after column."""
+        names = [DAY_COLUMN] + self.variables
+        payload = b"".join(self._column_bytes(name) for name in names)
+        return {
+            "encoding": "base64",
+            "dtype": "<f8",
+            "layout": "columns",
+            "rows": self.rows,
+            "columns": names,
+            "day_encoding": "ordinal",
+            "start": self.days()[0].isoformat() if self.rows else None,
+            "data": base64.b64encode(payload).decode("ascii"),
+        }
+
+    def write_npy(self, path: str) -> None:
+        """Write a (rows, 1 + variables) float64 ``.npy``; column order is ``[day] + variables``."""
+        names = [DAY_COLUMN] + self.variables
+        header = "{'descr': '<f8', 'fortran_order': True, 'shape': (%d, %d), }" % (self.rows, len(names))
+        # NPY 1.0: magic, version, uint16 header length; header padded so data is 64-byte aligned.
+        padding = 64 - (10 + len(header) + 1) % 64
+        header = header + " " * padding + "\n"
+        with open(path, "wb") as handle:
+            handle.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+            for name in names:
+                handle.write(self._column_bytes(name))
+
+    def write_csv(self, target: Any) -> None:
+        """Write CSV with an ISO ``date`` column to a path or an open text file."""
+        if isinstance(target, str):
+            with open(target, "w", newline="", encoding="utf-8") as handle:
+                self.write_csv(handle)
+            return
+        writer = csv.writer(target)
+        writer.writerow(["date"] + self.variables)
+        columns = [self.column(name) for name in self.variables]
+        for index, day in enumerate(self.days()):
+            writer.writerow([day.isoformat()] + ["" if math.isnan(column[index]) else repr(float(column[index])) for column in columns])
+
+    def to_csv(self) -> str:
+        buffer = io.StringIO()
+        self.write_csv(buffer)
+        return buffer.getvalue()
+
+    def to_arrow(self) -> Any:
+        """Return a ``pyarrow.Table`` (date32 ``date`` column plus float64 variables)."""
+        if _pa is None:
+            raise RuntimeError("Arrow export requires the optional 'pyarrow' package.")
+        arrays = [_pa.array(self.days(), type=_pa.date32())]
+        arrays += [_pa.array(self.column(name), type=_pa.float64(), from_pandas=True) for name in self.variables]
+        return _pa.Table.from_arrays(arrays, names=["date"] + self.variables)
+
+    def write_arrow(self, path: str) -> None:
+        """Write the table in the Arrow IPC file format (readable as Feather v2)."""
+        table = self.to_arrow()
+        with _pa.OSFile(path, "wb") as sink:
+            with _pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def export(self, fmt: str = "base64") -> Any:
+        """Protocol-friendly export: ``base64``, ``columns`` or ``csv``."""
+        fmt = (fmt or "base64").lower()
+        if fmt == "base64":
+            return self.to_base64()
+        if fmt in {"columns", "json"}:
+            return self.to_columns()
+        if fmt == "csv":
+            return {"encoding": "csv", "rows": self.rows, "data": self.to_csv()}
+        raise ValueError(f"Unsupported series format: {fmt}")
+
+
+def scalar_variables(variables: Iterable[str]) -> List[str]:
+    """Variables worth a column: SM_profile-style lists are skipped, derived scalars added."""
+    names = [name for name in variables if name != "SM_profile"]
+    if "TAGP" in names and "biomass" not in names:
+        names.append("biomass")
+    if any(name in names for name in ("TWSO", "TAGP")) and "yield_rate" not in names:
+        names.append("yield_rate")
+    return names
+
+
+def _as_float(value: Any) -> float:
+    if value is None or isinstance(value, (list, tuple, str)):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PyScripts"))
+
+
+@pytest.fixture
+def offline_weather():
+    """Serve POWER requests from bench's deterministic fixture and a private in-memory cache."""
+    import bench
+    import data
+    saved = data._fetch_power_parameters
+    bench.install_fixture()
+    yield
+    data._fetch_power_parameters = saved
+    data.set_weather_cache(None)
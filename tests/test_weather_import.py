@@ -0,0 +1,70 @@
+"""The bulk importer must store exactly what the live per-day POWER conversion would."""
+import json
+
+import pytest
+
+import bench
+import data
+
+FILL = -999.0
+
+
+def _power_payload(lat: float = 52.0, lon: float = 5.0, start: str = "20200101", end: str = "20201231"):
+    parameters = bench._fixture_parameters(lat, lon, start, end)
+    for offset, day_str in enumerate(sorted(parameters["T2M_MAX"])):
+        if offset % 37 == 0:
+            parameters["PRECTOTCORR"][day_str] = FILL
+        if offset % 41 == 0:
+            parameters["QV2M"][day_str] = None
+        if offset % 53 == 0:
+            parameters["ALLSKY_SFC_SW_DWN"][day_str] = FILL
+            parameters["T2M_MAX"][day_str] = FILL
+        if offset % 59 == 0:
+            del parameters["WS2M"][day_str]
+    return parameters
+
+
+def _columns(parameters):
+    day_strs = sorted(parameters["T2M_MAX"])
+    return day_strs, {name: [series.get(day_str) for day_str in day_strs] for name, series in parameters.items()}
+
+
+def _expected(parameters):
+    day_strs = sorted(parameters["T2M_MAX"])
+    records = {day_str: data._convert_power_record(parameters, day_str) for day_str in day_strs}
+    return {day_str: record for day_str, record in records.items() if record is not None}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_convert_power_columns_matches_per_day_converter(monkeypatch, use_numpy):
+    if use_numpy and data._np is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(data, "_np", None)
+    parameters = _power_payload()
+    expected = _expected(parameters)
+    assert 0 < len(expected) < len(parameters["T2M_MAX"])
+    assert data.convert_power_columns(*_columns(parameters)) == expected
+
+
+def _write_point_json(path, lat, lon, parameters):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"geometry": {"coordinates": [lon, lat, 10.0]}, "properties": {"parameter": parameters}}, handle)
+    return str(path)
+
+
+def _row_count(cache):
+    return cache._connect().execute("SELECT COUNT(*) FROM weather").fetchone()[0]
+
+
+def test_over_limit_import_rolls_back(tmp_path):
+    cache = data.WeatherCache(":memory:", max_rows=300)
+    cache.put_many(10.0, 10.0, {"20200101": {"TMAX": 1.0}})
+    first = _write_point_json(tmp_path / "a.json", 52.0, 5.0, bench._fixture_parameters(52.0, 5.0, "20200101", "20200630"))
+    second = _write_point_json(tmp_path / "b.json", 40.0, -100.0, bench._fixture_parameters(40.0, -100.0, "20200101", "20200630"))
+    # Each file fits on its own; together with the row already cached they do not.
+    with pytest.raises(ValueError):
+        data.import_weather_files([first, second], cache=cache)
+    assert _row_count(cache) == 1
+    summary = data.import_weather_files([first], cache=cache)
+    assert _row_count(cache) == 1 + summary["days"]